@@ -10,11 +10,15 @@ load_dotenv()
 from flask import Flask, send_from_directory
 from flask_cors import CORS
 from src.models.user import db
+from src.models.migrations import run_migrations
 from src.routes.user import user_bp
-from src.routes.jira_real import jira_bp
+from src.routes.jira_real import jira_bp, sync_scheduler
 from src.routes.auth import auth_bp
+from src.services.structured_log import configure_logging
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+# Logs estruturados com nível (JIRA_LOG_LEVEL) e request id em cada linha
+configure_logging(app)
 # Chave secreta para sessão (pode ser movida para .env)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'asdf#FGSgvasgf$5$WGT')
 
@@ -25,12 +29,21 @@ app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(jira_bp, url_prefix='/api/jira')
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
 
-# uncomment if you need to use database
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
+# Banco local (SQLite) com as issues sincronizadas do Jira
+database_dir = os.path.join(os.path.dirname(__file__), 'database')
+os.makedirs(database_dir, exist_ok=True)
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', f"sqlite:///{os.path.join(database_dir, 'app.db')}")
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db.init_app(app)
 with app.app_context():
-    db.create_all()
+    # Schema versionado: aplica apenas as migrações pendentes
+    run_migrations()
+
+# Syncs periódicos em segundo plano. Com o reloader do modo debug, só o
+# processo filho (WERKZEUG_RUN_MAIN) atende requisições e deve sincronizar.
+if os.getenv('JIRA_SYNC_SCHEDULER', 'true').lower() == 'true' and (
+        __name__ != '__main__' or os.getenv('WERKZEUG_RUN_MAIN') == 'true'):
+    sync_scheduler.start(app)
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
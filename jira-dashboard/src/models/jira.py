@@ -1,10 +1,22 @@
-from flask_sqlalchemy import SQLAlchemy
+import json
 from datetime import datetime
-
-db = SQLAlchemy()
+from sqlalchemy import func, literal
+# Usa a mesma instância inicializada em main.py
+from src.models.user import db
 
 class JiraIssue(db.Model):
     __tablename__ = 'jira_issues'
+    # Índices pelos padrões de acesso do dashboard: tudo é filtrado por projeto
+    __table_args__ = (
+        db.Index('ix_issues_project_created', 'project_key', 'created_date'),
+        db.Index('ix_issues_project_resolved', 'project_key', 'resolved_date'),
+        db.Index('ix_issues_project_updated', 'project_key', 'updated_date'),
+        db.Index('ix_issues_project_status', 'project_key', 'status'),
+        db.Index('ix_issues_project_type', 'project_key', 'issue_type'),
+        db.Index('ix_issues_project_priority', 'project_key', 'priority'),
+        db.Index('ix_issues_project_assignee', 'project_key', 'assignee_id'),
+        db.Index('ix_issues_project_reporter', 'project_key', 'reporter_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     jira_key = db.Column(db.String(50), unique=True, nullable=False)  # Ex: PROJ-123
@@ -24,8 +36,10 @@ class JiraIssue(db.Model):
     # Pessoas
     assignee_email = db.Column(db.String(200))
     assignee_name = db.Column(db.String(200))
+    assignee_id = db.Column(db.String(128))  # accountId do Jira
     reporter_email = db.Column(db.String(200))
     reporter_name = db.Column(db.String(200))
+    reporter_id = db.Column(db.String(128))
     creator_email = db.Column(db.String(200))
     creator_name = db.Column(db.String(200))
     
@@ -58,8 +72,10 @@ class JiraIssue(db.Model):
             'priority': self.priority,
             'assignee_email': self.assignee_email,
             'assignee_name': self.assignee_name,
+            'assignee_id': self.assignee_id,
             'reporter_email': self.reporter_email,
             'reporter_name': self.reporter_name,
+            'reporter_id': self.reporter_id,
             'creator_email': self.creator_email,
             'creator_name': self.creator_name,
             'fix_versions': self.fix_versions,
@@ -70,6 +86,88 @@ class JiraIssue(db.Model):
             'last_sync': self.last_sync.isoformat() if self.last_sync else None
         }
 
+class JiraIssueVersion(db.Model):
+    """Associação issue ↔ versão (fix version ou affected version)"""
+    __tablename__ = 'jira_issue_versions'
+    __table_args__ = (
+        db.UniqueConstraint('issue_key', 'kind', 'version_name', name='uq_issue_version'),
+        db.Index('ix_issue_versions_lookup', 'project_key', 'kind', 'version_name_normalized', 'issue_key'),
+        db.Index('ix_issue_versions_issue', 'issue_key'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    issue_key = db.Column(db.String(50), nullable=False)  # jira_issues.jira_key
+    project_key = db.Column(db.String(20), nullable=False)
+    kind = db.Column(db.String(10), nullable=False)  # 'fix' ou 'affected'
+    version_name = db.Column(db.String(200), nullable=False)
+    version_name_normalized = db.Column(db.String(200), nullable=False)  # strip().lower()
+    
+    def __repr__(self):
+        return f'<JiraIssueVersion {self.issue_key} {self.kind} {self.version_name}>'
+    
+    @staticmethod
+    def rows_for(jira_key: str, project_key: str, fix_versions: str, affected_versions: str) -> list:
+        """Linhas da associação a partir das colunas JSON de jira_issues"""
+        rows = []
+        for kind, raw in (('fix', fix_versions), ('affected', affected_versions)):
+            seen = set()
+            for name in json.loads(raw or '[]'):
+                if not name or name in seen:
+                    continue
+                seen.add(name)
+                rows.append({
+                    'issue_key': jira_key,
+                    'project_key': project_key,
+                    'kind': kind,
+                    'version_name': name,
+                    'version_name_normalized': name.strip().lower()
+                })
+        return rows
+
+class JiraDailyRollup(db.Model):
+    """Issues criadas/resolvidas por dia, projeto, tipo e prioridade (alimenta a timeline)"""
+    __tablename__ = 'jira_daily_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('project_key', 'metric', 'day', 'issue_type', 'priority', name='uq_daily_rollup'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    project_key = db.Column(db.String(20), nullable=False)
+    metric = db.Column(db.String(10), nullable=False)  # 'created' ou 'resolved'
+    day = db.Column(db.Date, nullable=False)
+    issue_type = db.Column(db.String(50), nullable=False, default='')
+    priority = db.Column(db.String(20), nullable=False, default='')
+    issue_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<JiraDailyRollup {self.project_key} {self.metric} {self.day}>'
+    
+    @classmethod
+    def refresh(cls, executor, project_key: str, days: set = None) -> None:
+        """Recalcula a partir de jira_issues as linhas do projeto, só dos dias informados se houver.
+
+        `executor` é a sessão ou conexão em uso, para participar da mesma transação.
+        """
+        delete = cls.__table__.delete().where(cls.project_key == project_key)
+        if days is not None:
+            if not days:
+                return
+            delete = delete.where(cls.day.in_(days))
+        executor.execute(delete)
+        issue_type = func.coalesce(JiraIssue.issue_type, '')
+        priority = func.coalesce(JiraIssue.priority, '')
+        for metric, column in (('created', JiraIssue.created_date), ('resolved', JiraIssue.resolved_date)):
+            day = func.date(column)
+            select = db.select(
+                literal(project_key), literal(metric), day, issue_type, priority, func.count()
+            ).where(JiraIssue.project_key == project_key, column.isnot(None))
+            if days is not None:
+                select = select.where(day.in_([d.isoformat() for d in days]))
+            select = select.group_by(day, issue_type, priority)
+            executor.execute(cls.__table__.insert().from_select(
+                ['project_key', 'metric', 'day', 'issue_type', 'priority', 'issue_count'], select
+            ))
+
 class JiraProject(db.Model):
     __tablename__ = 'jira_projects'
     
@@ -130,3 +228,32 @@ class JiraVersion(db.Model):
             'last_sync': self.last_sync.isoformat() if self.last_sync else None
         }
 
+
+class JiraSyncState(db.Model):
+    __tablename__ = 'jira_sync_state'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    project_key = db.Column(db.String(20), unique=True, nullable=False)
+    
+    # Maior 'updated' já sincronizado (horário local do Jira, sem fuso)
+    updated_watermark = db.Column(db.DateTime)
+    last_full_sync = db.Column(db.DateTime)
+    last_sync = db.Column(db.DateTime)
+    last_sync_mode = db.Column(db.String(10))  # 'full' ou 'delta'
+    last_sync_count = db.Column(db.Integer, default=0)
+    # Deslocamento (minutos) do fuso das datas devolvidas pelo Jira em relação a UTC
+    utc_offset_minutes = db.Column(db.Integer)
+    
+    def __repr__(self):
+        return f'<JiraSyncState {self.project_key}>'
+    
+    def to_dict(self):
+        return {
+            'project_key': self.project_key,
+            'updated_watermark': self.updated_watermark.isoformat() if self.updated_watermark else None,
+            'last_full_sync': self.last_full_sync.isoformat() if self.last_full_sync else None,
+            'last_sync': self.last_sync.isoformat() if self.last_sync else None,
+            'last_sync_mode': self.last_sync_mode,
+            'last_sync_count': self.last_sync_count,
+            'utc_offset_minutes': self.utc_offset_minutes
+        }
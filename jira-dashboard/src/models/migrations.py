@@ -0,0 +1,111 @@
+# Migrações versionadas do banco local.
+#
+# Cada migração roda uma única vez e fica registrada em `schema_version`.
+# As operações são idempotentes (checkfirst / verificação de colunas) para
+# que bancos criados por versões anteriores, inclusive via db.create_all(),
+# possam ser promovidos sem recriação.
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+from src.models.user import db, User
+from src.models.jira import (
+    JiraDailyRollup, JiraIssue, JiraIssueVersion, JiraProject, JiraVersion, JiraSyncState
+)
+from src.services.structured_log import get_logger
+
+logger = get_logger('migrations')
+
+SCHEMA_TABLE = 'schema_version'
+
+
+def _create_tables(*models) -> None:
+    for model in models:
+        model.__table__.create(db.engine, checkfirst=True)
+
+
+def _add_column(table: str, column: str, ddl: str) -> None:
+    columns = {c['name'] for c in inspect(db.engine).get_columns(table)}
+    if column not in columns:
+        with db.engine.begin() as conn:
+            conn.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}'))
+
+
+def _create_indexes(model) -> None:
+    for index in model.__table__.indexes:
+        index.create(db.engine, checkfirst=True)
+
+
+def _baseline() -> None:
+    """Tabelas originais do dashboard"""
+    _create_tables(User, JiraProject, JiraVersion, JiraIssue, JiraSyncState, JiraIssueVersion)
+    _add_column('jira_issues', 'assignee_id', 'VARCHAR(128)')
+    _add_column('jira_issues', 'reporter_id', 'VARCHAR(128)')
+
+
+def _issue_indexes() -> None:
+    """Índices compostos de jira_issues e da associação de versões"""
+    _create_indexes(JiraIssue)
+    _create_indexes(JiraIssueVersion)
+
+
+def _backfill_issue_versions() -> None:
+    """Preenche jira_issue_versions a partir das colunas JSON de jira_issues"""
+    with db.engine.begin() as conn:
+        conn.execute(JiraIssueVersion.__table__.delete())
+        rows = conn.execute(db.select(
+            JiraIssue.jira_key, JiraIssue.project_key, JiraIssue.fix_versions, JiraIssue.affected_versions
+        )).all()
+        version_rows = [v for row in rows for v in JiraIssueVersion.rows_for(*row)]
+        if version_rows:
+            conn.execute(JiraIssueVersion.__table__.insert(), version_rows)
+
+
+def _daily_rollups() -> None:
+    """Cria jira_daily_rollups e a preenche com o histórico de cada projeto"""
+    _create_tables(JiraDailyRollup)
+    with db.engine.begin() as conn:
+        projects = conn.execute(db.select(JiraIssue.project_key).distinct()).scalars().all()
+        for project_key in projects:
+            JiraDailyRollup.refresh(conn, project_key)
+
+
+def _sync_state_offset() -> None:
+    """Fuso das datas do Jira por projeto, para as janelas de tempo do banco local"""
+    _add_column('jira_sync_state', 'utc_offset_minutes', 'INTEGER')
+
+
+# (versão, descrição, função) — acrescente novas migrações sempre ao final
+MIGRATIONS = [
+    (1, 'baseline', _baseline),
+    (2, 'jira_issues composite indexes', _issue_indexes),
+    (3, 'backfill jira_issue_versions', _backfill_issue_versions),
+    (4, 'jira_daily_rollups', _daily_rollups),
+    (5, 'jira_sync_state utc offset', _sync_state_offset),
+]
+
+
+def current_version() -> int:
+    with db.engine.begin() as conn:
+        conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS {SCHEMA_TABLE} ('
+            'version INTEGER PRIMARY KEY, description VARCHAR(200), applied_at DATETIME)'
+        ))
+        return conn.execute(text(f'SELECT COALESCE(MAX(version), 0) FROM {SCHEMA_TABLE}')).scalar()
+
+
+def run_migrations() -> int:
+    """Aplica as migrações pendentes e retorna a versão final do schema"""
+    version = current_version()
+    for number, description, migrate in MIGRATIONS:
+        if number <= version:
+            continue
+        logger.info("Aplicando migração %s: %s", number, description)
+        migrate()
+        with db.engine.begin() as conn:
+            conn.execute(
+                text(f'INSERT INTO {SCHEMA_TABLE} (version, description, applied_at) VALUES (:v, :d, :t)'),
+                {'v': number, 'd': description, 't': datetime.utcnow()}
+            )
+        version = number
+    return version
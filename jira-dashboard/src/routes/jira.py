@@ -1,7 +1,7 @@
 from flask import Blueprint, jsonify, request
 from flask_cors import cross_origin
 from src.models.user import db
-from src.models.jira import JiraIssue, JiraProject, JiraVersion
+from src.models.jira import JiraIssue, JiraIssueVersion, JiraProject, JiraVersion
 from src.services.jira_service import JiraService
 from sqlalchemy import func, and_, or_
 from datetime import datetime, timedelta
@@ -26,18 +26,20 @@ def sync_jira_data():
         # Verifica se é sincronização completa ou parcial
         data = request.get_json() or {}
         project_key = data.get('project_key')
+        # Por padrão a sincronização é incremental; 'full' força a recarga completa
+        full = bool(data.get('full', False))
         
         if project_key:
             # Sincronização de um projeto específico
             jira_service.sync_versions_to_db(project_key)
-            jira_service.sync_issues_to_db(project_key)
+            result = jira_service.sync_issues_to_db(project_key, full=full)
             message = f"Sincronização do projeto {project_key} concluída"
         else:
-            # Sincronização completa
-            jira_service.full_sync()
+            # Sincronização de todos os projetos
+            result = jira_service.full_sync(full=full)
             message = "Sincronização completa concluída"
         
-        return jsonify({'success': True, 'message': message})
+        return jsonify({'success': True, 'message': message, 'result': result})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -100,45 +102,12 @@ def get_issues():
             query = query.filter(JiraIssue.reporter_email == reporter_email)
         
         if fix_version:
-            all_issues = query.all()
-            filtered_issues = []
-            for issue in all_issues:
-                # Sempre tratar fix_versions como array
-                try:
-                    versions = json.loads(issue.fix_versions) if issue.fix_versions else []
-                    if isinstance(versions, str):
-                        versions = [versions]
-                except Exception:
-                    versions = [v.strip() for v in issue.fix_versions.split(',')] if issue.fix_versions else []
-                def normaliza(v):
-                    return v.strip().lower()
-                match = any(normaliza(fix_version) == normaliza(v) for v in versions)
-                if match:
-                    filtered_issues.append(issue)
-            # Paginação manual após filtro
-            total = len(filtered_issues)
-            start = (page - 1) * per_page
-            end = start + per_page
-            paginated_issues = filtered_issues[start:end]
-            # Padronizar retorno: fix_versions sempre como array
-            def issue_to_dict_with_versions(issue):
-                d = issue.to_dict()
-                try:
-                    d['fix_versions'] = json.loads(d['fix_versions']) if d['fix_versions'] else []
-                    if isinstance(d['fix_versions'], str):
-                        d['fix_versions'] = [d['fix_versions']]
-                except Exception:
-                    d['fix_versions'] = [v.strip() for v in d['fix_versions'].split(',')] if d['fix_versions'] else []
-                return d
-            return jsonify({
-                'issues': [issue_to_dict_with_versions(issue) for issue in paginated_issues],
-                'total': total,
-                'pages': (total // per_page) + (1 if total % per_page else 0),
-                'current_page': page,
-                'per_page': per_page,
-                'has_next': end < total,
-                'has_prev': start > 0
-            })
+            # Filtra pela tabela de associação (mesma normalização strip + lower do sync)
+            query = query.join(JiraIssueVersion, and_(
+                JiraIssueVersion.issue_key == JiraIssue.jira_key,
+                JiraIssueVersion.kind == 'fix',
+                JiraIssueVersion.version_name_normalized == fix_version.strip().lower()
+            ))
         
         if issue_type:
             query = query.filter(JiraIssue.issue_type == issue_type)
@@ -369,15 +338,10 @@ def get_filter_options():
         ]
         
         # Versões únicas (fix versions)
-        versions = set()
-        issues_with_versions = base_query.filter(JiraIssue.fix_versions.isnot(None)).all()
-        for issue in issues_with_versions:
-            if issue.fix_versions:
-                try:
-                    version_list = json.loads(issue.fix_versions)
-                    versions.update(version_list)
-                except:
-                    pass
+        versions = db.session.query(JiraIssueVersion.version_name).filter(JiraIssueVersion.kind == 'fix')
+        if project_key:
+            versions = versions.filter(JiraIssueVersion.project_key == project_key)
+        versions = [v[0] for v in versions.distinct().all()]
         
         return jsonify({
             'statuses': sorted(statuses),
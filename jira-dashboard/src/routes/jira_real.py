@@ -1,11 +1,17 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from flask_cors import cross_origin
-from src.services.jira_service import JiraService
+from src.services.jira_service import BULK_MAX_UPDATES, FIELD_PROFILES, JiraService
+from src.services.local_store import LocalIssueStore
+from src.services.export_writer import EXPORT_FORMATS
+from src.services.sync_scheduler import SyncScheduler
+from src.services.webhook_ingest import WEBHOOK_SECRET, WebhookIngestor, verify_signature
+from src.services.structured_log import get_logger
 from datetime import datetime, timedelta
 import json
 import os
 
 jira_bp = Blueprint('jira', __name__)
+logger = get_logger('api')
 
 # Configurações do Jira
 JIRA_CONFIG = {
@@ -17,26 +23,251 @@ JIRA_CONFIG = {
 # Instância do serviço Jira
 jira_service = JiraService(**JIRA_CONFIG)
 
+# 'local' serve os dados do banco sincronizado (com sync em segundo plano); 'live' consulta o Jira a cada requisição
+SERVING_MODE = os.getenv('JIRA_SERVING_MODE', 'local').lower()
+# Syncs em segundo plano (periódicos e manuais), iniciado em main.py
+sync_scheduler = SyncScheduler(jira_service)
+local_store = LocalIssueStore(jira_service, sync_scheduler)
+# Eventos do webhook do Jira aplicados em lotes no banco local
+webhook_ingestor = WebhookIngestor(jira_service)
+
+def _filters_from_request(include_fix_version: bool = True) -> dict:
+    """Monta o dicionário de filtros a partir dos parâmetros da requisição"""
+    filters = {}
+    mapping = {
+        'project_key': 'project',
+        'status': 'status',
+        'assignee_email': 'assignee',
+        'reporter_email': 'reporter',
+        'issue_type': 'issuetype',
+        'priority': 'priority',
+        'created_after': 'created_after',
+        'created_before': 'created_before'
+    }
+    if include_fix_version:
+        mapping['fix_version'] = 'fix_version'
+    for arg, key in mapping.items():
+        value = request.args.get(arg)
+        if value:
+            filters[key] = value
+    return filters
+
+def _profile_from_request(default: str = 'table') -> str:
+    """Perfil de campos pedido (aggregate, table ou detail)"""
+    profile = request.args.get('profile', default)
+    return profile if profile in FIELD_PROFILES else default
+
+def _wants_ndjson() -> bool:
+    """Cliente pediu NDJSON (stream=1 ou Accept: application/x-ndjson)"""
+    if request.args.get('stream', '').lower() in ('1', 'true'):
+        return True
+    return request.accept_mimetypes.best == 'application/x-ndjson'
+
+def _data_source(project_key):
+    """Escolhe entre o banco local e o Jira para atender a requisição"""
+    if SERVING_MODE != 'local' or not project_key:
+        return jira_service
+    try:
+        local_store.ensure_fresh(project_key)
+        if local_store.is_ready(project_key):
+            return local_store
+    except Exception as e:
+        logger.warning("Banco local indisponível para %s, usando o Jira: %s", project_key, e)
+    return jira_service
+
+def _freshness(source, project_key):
+    """Descreve a origem e a idade dos dados da resposta"""
+    if source is local_store:
+        return local_store.freshness(project_key)
+    return {'source': 'live', 'as_of': datetime.utcnow().isoformat()}
+
+def _sample_issues_page(project_key, page, per_page):
+    """Página de issues de exemplo usada quando o Jira não responde"""
+    sample_issues = [
+        {
+            'id': 1,
+            'jira_key': 'ECOM-123',
+            'jira_id': '10101',
+            'summary': 'Implementar carrinho de compras',
+            'description': 'Desenvolver funcionalidade de carrinho de compras com persistência',
+            'project_key': project_key or 'ECOM',
+            'project_name': 'E-commerce Platform',
+            'status': 'In Progress',
+            'issue_type': 'Story',
+            'priority': 'High',
+            'assignee_email': 'dev1@marisapartner.com.br',
+            'assignee_name': 'Ana Costa',
+            'reporter_email': 'po@marisapartner.com.br',
+            'reporter_name': 'Pedro Manager',
+            'creator_email': 'po@marisapartner.com.br',
+            'creator_name': 'Pedro Manager',
+            'fix_versions': '["v2.1.0"]',
+            'affected_versions': '[]',
+            'created_date': (datetime.now() - timedelta(days=5)).isoformat(),
+            'updated_date': (datetime.now() - timedelta(days=1)).isoformat(),
+            'resolved_date': None
+        }
+    ]
+    
+    return {
+        'issues': sample_issues,
+        'total': len(sample_issues),
+        'pages': 1,
+        'current_page': page,
+        'per_page': per_page,
+        'has_next': False,
+        'has_prev': False
+    }
+
+def _sample_stats():
+    """Estatísticas de exemplo usadas quando o Jira não responde"""
+    return {
+        'total_issues': 42,
+        'recent_issues': 10,
+        'resolved_issues': 7,
+        'status_distribution': [
+            {'status': 'In Progress', 'count': 12},
+            {'status': 'Done', 'count': 20},
+            {'status': 'To Do', 'count': 10}
+        ],
+        'type_distribution': [
+            {'type': 'Story', 'count': 15},
+            {'type': 'Bug', 'count': 10},
+            {'type': 'Feature', 'count': 7},
+            {'type': 'Task', 'count': 5},
+            {'type': 'Improvement', 'count': 5}
+        ],
+        'priority_distribution': [
+            {'priority': 'High', 'count': 10},
+            {'priority': 'Critical', 'count': 5},
+            {'priority': 'Medium', 'count': 20},
+            {'priority': 'Low', 'count': 7}
+        ],
+        'assignee_distribution': [
+            {'assignee': 'Ana Costa', 'count': 15},
+            {'assignee': 'Bruno Silva', 'count': 10},
+            {'assignee': 'Diana Mobile', 'count': 7},
+            {'assignee': 'Felipe DevOps', 'count': 10}
+        ],
+        'backlog_aging': [
+            {
+                'time_range': '0-5 dias',
+                'total': 8,
+                'critical': 2,
+                'high': 3,
+                'medium': 2,
+                'low': 1,
+                'no_priority': 0
+            },
+            {
+                'time_range': '6-15 dias',
+                'total': 12,
+                'critical': 1,
+                'high': 4,
+                'medium': 5,
+                'low': 2,
+                'no_priority': 0
+            },
+            {
+                'time_range': '16-30 dias',
+                'total': 6,
+                'critical': 0,
+                'high': 2,
+                'medium': 3,
+                'low': 1,
+                'no_priority': 0
+            },
+            {
+                'time_range': 'Mais de 30 dias',
+                'total': 4,
+                'critical': 1,
+                'high': 1,
+                'medium': 1,
+                'low': 0,
+                'no_priority': 1
+            }
+        ]
+    }
+
+def _sample_timeline(days):
+    """Timeline de exemplo usada quando o Jira não responde"""
+    timeline_data = []
+    for i in range(days):
+        date = (datetime.now() - timedelta(days=days-i-1)).date()
+        count = 1 if i % 3 == 0 else 0
+        timeline_data.append({'date': str(date), 'count': count})
+    return {
+        'created_timeline': timeline_data,
+        'resolved_timeline': timeline_data
+    }
+
+def _sample_filter_options():
+    """Opções de filtro de exemplo usadas quando o Jira não responde"""
+    return {
+        'statuses': ['To Do', 'In Progress', 'Done'],
+        'types': ['Story', 'Bug', 'Feature', 'Task', 'Improvement'],
+        'priorities': ['Critical', 'High', 'Medium', 'Low'],
+        'assignees': [
+            {'email': 'dev1@marisapartner.com.br', 'name': 'Ana Costa'},
+            {'email': 'dev2@marisapartner.com.br', 'name': 'Bruno Silva'}
+        ],
+        'reporters': [
+            {'email': 'po@marisapartner.com.br', 'name': 'Pedro Manager'},
+            {'email': 'qa@marisapartner.com.br', 'name': 'Carla QA'}
+        ],
+        'versions': ['v2.0.0', 'v2.0.1', 'v2.1.0']
+    }
+
+
 @jira_bp.route('/sync', methods=['POST'])
 @cross_origin()
 def sync_jira_data():
-    """Sincroniza dados com o Jira"""
+    """Coloca a sincronização com o Jira na fila do agendador e responde sem esperar"""
     try:
-        data = request.get_json() or {}
+        data = request.get_json(silent=True) or {}
         project_key = data.get('project_key')
-        
-        # Aqui você pode implementar a lógica de sincronização real
-        # Por exemplo, buscar dados do Jira e salvar no banco de dados
-        
+        full = bool(data.get('full', False))
+
         if project_key:
-            message = f"Sincronização do projeto {project_key} concluída"
+            if not sync_scheduler.is_known(project_key):
+                return jsonify({'success': False, 'error': f"Projeto {project_key} não encontrado"}), 404
+            queued = [project_key] if sync_scheduler.enqueue(project_key, full=full, manual=True) else []
+            message = f"Sincronização do projeto {project_key} {'agendada' if queued else 'já em andamento'}"
         else:
-            message = "Sincronização completa concluída"
-        
-        return jsonify({'success': True, 'message': message})
+            queued = sync_scheduler.enqueue_all(full=full, manual=True)
+            message = f"Sincronização agendada para {len(queued)} projeto(s)"
+
+        return jsonify({
+            'success': True,
+            'message': message,
+            'queued': queued,
+            'status': sync_scheduler.status(project_key)
+        }), 202
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@jira_bp.route('/sync/status', methods=['GET'])
+@cross_origin()
+def sync_status():
+    """Última execução, duração, issues alteradas e erros dos syncs por projeto"""
+    status = sync_scheduler.status(request.args.get('project_key'))
+    status['webhook'] = webhook_ingestor.status()
+    return jsonify(status)
+
+@jira_bp.route('/webhook', methods=['POST'])
+def jira_webhook():
+    """Recebe eventos de issue/versão do Jira e os enfileira para aplicação em lote"""
+    if not WEBHOOK_SECRET:
+        return jsonify({'error': 'Webhook desativado (JIRA_WEBHOOK_SECRET não configurado)'}), 503
+    if not verify_signature(WEBHOOK_SECRET, request.get_data(), request.headers, request.args):
+        return jsonify({'error': 'Assinatura inválida'}), 401
+    event = request.get_json(silent=True)
+    if not isinstance(event, dict) or not event.get('webhookEvent'):
+        return jsonify({'error': 'Evento inválido'}), 400
+    if not webhook_ingestor.enqueue(event):
+        return jsonify({'error': 'Fila de eventos cheia'}), 503
+    return jsonify({'success': True}), 202
+
 @jira_bp.route('/projects', methods=['GET'])
 @cross_origin()
 def get_projects():
@@ -45,7 +276,7 @@ def get_projects():
         projects = jira_service.get_projects()
         return jsonify(projects)
     except Exception as e:
-        print(f"Erro ao buscar projetos: {e}")
+        logger.error("Erro ao buscar projetos: %s", e)
         # Fallback para dados de exemplo em caso de erro
         sample_projects = [
             {
@@ -76,10 +307,11 @@ def get_projects():
 def get_project_versions(project_key):
     """Obtém versões de um projeto do Jira"""
     try:
-        versions = jira_service.get_project_versions(project_key)
+        source = _data_source(project_key)
+        versions = source.get_project_versions(project_key)
         return jsonify(versions)
     except Exception as e:
-        print(f"Erro ao buscar versões: {e}")
+        logger.error("Erro ao buscar versões: %s", e)
         # Fallback para dados de exemplo
         sample_versions = [
             {'id': 1, 'jira_id': '1001', 'name': 'v2.0.0', 'released': True, 'project_key': project_key},
@@ -94,105 +326,64 @@ def get_issues():
     try:
         # Parâmetros de filtro
         project_key = request.args.get('project_key')
-        status = request.args.get('status')
-        assignee_email = request.args.get('assignee_email')
-        reporter_email = request.args.get('reporter_email')
-        fix_version = request.args.get('fix_version')
-        issue_type = request.args.get('issue_type')
-        priority = request.args.get('priority')
-        created_after = request.args.get('created_after')
-        created_before = request.args.get('created_before')
         
         # Parâmetros de paginação
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 50))
         fetch_all = request.args.get('fetch_all', 'false').lower() == 'true'
         
-        # LOG: Debug de filtros (especialmente para exportação)
-        if fetch_all:
-            print(f"[EXPORTAÇÃO] Filtros recebidos:")
-            print(f"  project_key: '{project_key}'")
-            print(f"  fix_version: '{fix_version}' (tipo: {type(fix_version)})")
-            print(f"  status: '{status}'")
-            print(f"  fetch_all: {fetch_all}")
-        
         # Monta filtros para o Jira
-        filters = {}
-        created_clauses = []
-        if project_key:
-            filters['project'] = project_key
-        if status:
-            filters['status'] = status
-        if assignee_email:
-            filters['assignee'] = assignee_email
-        if reporter_email:
-            filters['reporter'] = reporter_email
-        if issue_type:
-            filters['issuetype'] = issue_type
-        if priority:
-            filters['priority'] = priority
-        if created_after:
-            created_clauses.append(f"created >= '{created_after}'")
-        if created_before:
-            created_clauses.append(f"created <= '{created_before}'")
-        if created_clauses:
-            filters['created'] = ' AND '.join(created_clauses)
-        if fix_version:
-            filters['fix_version'] = fix_version
-            
-        # LOG: Debug do dicionário de filtros montado
+        filters = _filters_from_request()
         if fetch_all:
-            print(f"[EXPORTAÇÃO] Filtros montados para Jira: {filters}")
+            logger.debug("Busca completa de issues com filtros %s", filters)
         
-        # Busca issues do Jira
-        issues_data = jira_service.get_issues(filters, page, per_page, fetch_all=fetch_all)
-        
-        # LOG: Debug do resultado
-        if fetch_all:
-            print(f"[EXPORTAÇÃO] Resultado: {len(issues_data.get('issues', []))} issues encontradas")
+        # Busca issues do banco local ou do Jira
+        source = _data_source(project_key)
+        if fetch_all and _wants_ndjson():
+            # Uma issue por linha, enviada assim que a página correspondente chega
+            issues = source.iter_issues(filters, _profile_from_request())
+            return Response(
+                stream_with_context(json.dumps(issue, default=str) + '\n' for issue in issues),
+                mimetype='application/x-ndjson'
+            )
+        issues_data = source.get_issues(filters, page, per_page, fetch_all=fetch_all, profile=_profile_from_request())
+        issues_data['data_freshness'] = _freshness(source, project_key)
             
         if not issues_data or not issues_data.get('issues'):
             raise Exception('Sem dados do Jira')
         return jsonify(issues_data)
         
     except Exception as e:
-        print(f"Erro ao buscar issues: {e}")
+        logger.error("Erro ao buscar issues: %s", e)
         # Fallback para dados de exemplo em caso de erro
-        sample_issues = [
-            {
-                'id': 1,
-                'jira_key': 'ECOM-123',
-                'jira_id': '10101',
-                'summary': 'Implementar carrinho de compras',
-                'description': 'Desenvolver funcionalidade de carrinho de compras com persistência',
-                'project_key': project_key or 'ECOM',
-                'project_name': 'E-commerce Platform',
-                'status': 'In Progress',
-                'issue_type': 'Story',
-                'priority': 'High',
-                'assignee_email': 'dev1@marisapartner.com.br',
-                'assignee_name': 'Ana Costa',
-                'reporter_email': 'po@marisapartner.com.br',
-                'reporter_name': 'Pedro Manager',
-                'creator_email': 'po@marisapartner.com.br',
-                'creator_name': 'Pedro Manager',
-                'fix_versions': '["v2.1.0"]',
-                'affected_versions': '[]',
-                'created_date': (datetime.now() - timedelta(days=5)).isoformat(),
-                'updated_date': (datetime.now() - timedelta(days=1)).isoformat(),
-                'resolved_date': None
-            }
-        ]
-        
-        return jsonify({
-            'issues': sample_issues,
-            'total': len(sample_issues),
-            'pages': 1,
-            'current_page': page,
-            'per_page': per_page,
-            'has_next': False,
-            'has_prev': False
-        })
+        return jsonify(_sample_issues_page(project_key, page, per_page))
+
+@jira_bp.route('/export', methods=['GET'])
+@cross_origin()
+def export_issues():
+    """Exporta as issues filtradas em CSV ou XLSX, enviadas à medida que as páginas chegam"""
+    export_format = request.args.get('format', 'xlsx').lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f'Formato não suportado: {export_format}'}), 400
+    project_key = request.args.get('project_key')
+    filters = _filters_from_request()
+    source = _data_source(project_key)
+    writer, mimetype = EXPORT_FORMATS[export_format]
+
+    def generate():
+        try:
+            yield from writer(source.iter_issues(filters))
+        except Exception as e:
+            # Os cabeçalhos já foram enviados; o arquivo chega truncado
+            logger.exception("Erro durante a exportação")
+            raise
+
+    filename = f"jira-issues-{project_key or 'todos'}-{datetime.now().strftime('%Y-%m-%d')}.{export_format}"
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
 
 @jira_bp.route('/dashboard/stats', methods=['GET'])
 @cross_origin()
@@ -201,111 +392,23 @@ def get_dashboard_stats():
     try:
         # Parâmetros de filtro
         project_key = request.args.get('project_key')
-        status = request.args.get('status')
-        assignee_email = request.args.get('assignee_email')
-        reporter_email = request.args.get('reporter_email')
-        fix_version = request.args.get('fix_version')
-        issue_type = request.args.get('issue_type')
-        priority = request.args.get('priority')
-        created_after = request.args.get('created_after')
-        created_before = request.args.get('created_before')
-
-        filters = {}
-        created_clauses = []
-        if project_key:
-            filters['project'] = project_key
-        if status:
-            filters['status'] = status
-        if assignee_email:
-            filters['assignee'] = assignee_email
-        if reporter_email:
-            filters['reporter'] = reporter_email
-        if issue_type:
-            filters['issuetype'] = issue_type
-        if priority:
-            filters['priority'] = priority
-        if created_after:
-            created_clauses.append(f"created >= '{created_after}'")
-        if created_before:
-            created_clauses.append(f"created <= '{created_before}'")
-        if created_clauses:
-            filters['created'] = ' AND '.join(created_clauses)
-
-        # Busca estatísticas do Jira
-        stats = jira_service.get_dashboard_stats(filters)
+        filters = _filters_from_request(include_fix_version=False)
+
+        # Busca estatísticas do banco local ou do Jira
+        source = _data_source(project_key)
+        if request.args.get('counts_only', 'false').lower() == 'true':
+            # Apenas total, recentes e resolvidas: contagens, sem baixar as issues
+            stats = source.get_issue_counts(filters)
+        else:
+            stats = source.get_dashboard_stats(filters)
         if not stats:
             raise Exception('Sem dados do Jira')
+        stats['data_freshness'] = _freshness(source, project_key)
         return jsonify(stats)
     except Exception as e:
-        print(f"Erro ao buscar estatísticas: {e}")
+        logger.error("Erro ao buscar estatísticas: %s", e)
         # Fallback para dados de exemplo, sempre preenchidos
-        return jsonify({
-            'total_issues': 42,
-            'recent_issues': 10,
-            'resolved_issues': 7,
-            'status_distribution': [
-                {'status': 'In Progress', 'count': 12},
-                {'status': 'Done', 'count': 20},
-                {'status': 'To Do', 'count': 10}
-            ],
-            'type_distribution': [
-                {'type': 'Story', 'count': 15},
-                {'type': 'Bug', 'count': 10},
-                {'type': 'Feature', 'count': 7},
-                {'type': 'Task', 'count': 5},
-                {'type': 'Improvement', 'count': 5}
-            ],
-            'priority_distribution': [
-                {'priority': 'High', 'count': 10},
-                {'priority': 'Critical', 'count': 5},
-                {'priority': 'Medium', 'count': 20},
-                {'priority': 'Low', 'count': 7}
-            ],
-            'assignee_distribution': [
-                {'assignee': 'Ana Costa', 'count': 15},
-                {'assignee': 'Bruno Silva', 'count': 10},
-                {'assignee': 'Diana Mobile', 'count': 7},
-                {'assignee': 'Felipe DevOps', 'count': 10}
-            ],
-            'backlog_aging': [
-                {
-                    'time_range': '0-5 dias',
-                    'total': 8,
-                    'critical': 2,
-                    'high': 3,
-                    'medium': 2,
-                    'low': 1,
-                    'no_priority': 0
-                },
-                {
-                    'time_range': '6-15 dias',
-                    'total': 12,
-                    'critical': 1,
-                    'high': 4,
-                    'medium': 5,
-                    'low': 2,
-                    'no_priority': 0
-                },
-                {
-                    'time_range': '16-30 dias',
-                    'total': 6,
-                    'critical': 0,
-                    'high': 2,
-                    'medium': 3,
-                    'low': 1,
-                    'no_priority': 0
-                },
-                {
-                    'time_range': 'Mais de 30 dias',
-                    'total': 4,
-                    'critical': 1,
-                    'high': 1,
-                    'medium': 1,
-                    'low': 0,
-                    'no_priority': 1
-                }
-            ]
-        })
+        return jsonify(_sample_stats())
 
 @jira_bp.route('/dashboard/timeline', methods=['GET'])
 @cross_origin()
@@ -315,52 +418,18 @@ def get_timeline_data():
         # Parâmetros de filtro
         project_key = request.args.get('project_key')
         days = int(request.args.get('days', 30))
-        status = request.args.get('status')
-        assignee_email = request.args.get('assignee_email')
-        reporter_email = request.args.get('reporter_email')
-        fix_version = request.args.get('fix_version')
-        issue_type = request.args.get('issue_type')
-        priority = request.args.get('priority')
-        created_after = request.args.get('created_after')
-        created_before = request.args.get('created_before')
-
-        filters = {}
-        created_clauses = []
-        if project_key:
-            filters['project'] = project_key
-        if status:
-            filters['status'] = status
-        if assignee_email:
-            filters['assignee'] = assignee_email
-        if reporter_email:
-            filters['reporter'] = reporter_email
-        if issue_type:
-            filters['issuetype'] = issue_type
-        if priority:
-            filters['priority'] = priority
-        if created_after:
-            created_clauses.append(f"created >= '{created_after}'")
-        if created_before:
-            created_clauses.append(f"created <= '{created_before}'")
-        if created_clauses:
-            filters['created'] = ' AND '.join(created_clauses)
-
-        # Busca dados de timeline do Jira
-        timeline = jira_service.get_timeline_data(filters, days)
+        filters = _filters_from_request(include_fix_version=False)
+
+        # Busca dados de timeline do banco local ou do Jira
+        source = _data_source(project_key)
+        timeline = source.get_timeline_data(filters, days)
         if not timeline or not timeline.get('created_timeline'):
             raise Exception('Sem dados do Jira')
+        timeline['data_freshness'] = _freshness(source, project_key)
         return jsonify(timeline)
     except Exception as e:
-        print(f"Erro ao buscar timeline: {e}")
-        timeline_data = []
-        for i in range(days):
-            date = (datetime.now() - timedelta(days=days-i-1)).date()
-            count = 1 if i % 3 == 0 else 0
-            timeline_data.append({'date': str(date), 'count': count})
-        return jsonify({
-            'created_timeline': timeline_data,
-            'resolved_timeline': timeline_data
-        })
+        logger.error("Erro ao buscar timeline: %s", e)
+        return jsonify(_sample_timeline(days))
 
 @jira_bp.route('/filters/options', methods=['GET'])
 @cross_origin()
@@ -369,29 +438,66 @@ def get_filter_options():
     try:
         project_key = request.args.get('project_key')
         
-        # Busca opções de filtro do Jira
-        options = jira_service.get_filter_options(project_key)
+        # Busca opções de filtro do banco local ou do Jira
+        source = _data_source(project_key)
+        options = source.get_filter_options(project_key)
         if not options or not options.get('statuses'):
             raise Exception('Sem dados do Jira')
+        options['data_freshness'] = _freshness(source, project_key)
         return jsonify(options)
         
     except Exception as e:
-        print(f"Erro ao buscar opções de filtro: {e}")
+        logger.error("Erro ao buscar opções de filtro: %s", e)
+        return jsonify(_sample_filter_options())
+
+@jira_bp.route('/dashboard/bundle', methods=['GET'])
+@cross_origin()
+def get_dashboard_bundle():
+    """Obtém estatísticas, timeline, opções de filtro, total do projeto e issues em uma resposta"""
+    project_key = request.args.get('project_key')
+    days = int(request.args.get('days', 30))
+    page = int(request.args.get('page', 1))
+    per_page = int(request.args.get('per_page', 50))
+    try:
+        filters = _filters_from_request()
+        source = _data_source(project_key)
+        bundle = source.get_dashboard_bundle(filters, days, page, per_page)
+        # Filtro sem resultados (ou página além do fim) é resposta válida: estatísticas zeradas, página vazia
+        if bundle['stats'] is None:
+            raise Exception('Sem dados do Jira')
+        bundle['data_freshness'] = _freshness(source, project_key)
+        return jsonify(bundle)
+    except Exception as e:
+        logger.error("Erro ao buscar bundle do dashboard: %s", e)
+        stats = _sample_stats()
         return jsonify({
-            'statuses': ['To Do', 'In Progress', 'Done'],
-            'types': ['Story', 'Bug', 'Feature', 'Task', 'Improvement'],
-            'priorities': ['Critical', 'High', 'Medium', 'Low'],
-            'assignees': [
-                {'email': 'dev1@marisapartner.com.br', 'name': 'Ana Costa'},
-                {'email': 'dev2@marisapartner.com.br', 'name': 'Bruno Silva'}
-            ],
-            'reporters': [
-                {'email': 'po@marisapartner.com.br', 'name': 'Pedro Manager'},
-                {'email': 'qa@marisapartner.com.br', 'name': 'Carla QA'}
-            ],
-            'versions': ['v2.0.0', 'v2.0.1', 'v2.1.0']
+            'stats': stats,
+            'timeline': _sample_timeline(days),
+            'filter_options': _sample_filter_options(),
+            'project_total_issues': stats['total_issues'],
+            'issues': _sample_issues_page(project_key, page, per_page)
         })
 
+@jira_bp.route('/issues/<issue_key>', methods=['GET'])
+@cross_origin()
+def get_issue_detail(issue_key):
+    """Obtém uma issue com todos os campos, inclusive a descrição"""
+    try:
+        project_key = issue_key.split('-')[0]
+        source = _data_source(project_key)
+        issue = source.get_issue(issue_key)
+        if issue is None and source is local_store:
+            # Issue criada depois do último sync
+            source = jira_service
+            issue = jira_service.get_issue(issue_key)
+        if issue is None:
+            return jsonify({'error': f'Issue {issue_key} não encontrada'}), 404
+        issue['data_freshness'] = _freshness(source, project_key)
+        return jsonify(issue)
+    except Exception as e:
+        logger.error("Erro ao buscar issue %s: %s", issue_key, e)
+        return jsonify({'error': str(e)}), 500
+
 @jira_bp.route('/issues/<issue_key>', methods=['PUT'])
 @cross_origin()
 def update_issue(issue_key):
@@ -406,7 +512,8 @@ def update_issue(issue_key):
                 'message': 'Nenhum dado fornecido para atualização'
             }), 400
         
-        print(f"[UPDATE ENDPOINT] Atualizando issue {issue_key} com dados: {update_data}")
+        logger.info("Atualizando issue %s (campos: %s)", issue_key, ', '.join(update_data))
+        logger.debug("Dados da atualização de %s: %s", issue_key, update_data)
         
         # Chamar serviço para atualizar no Jira
         result = jira_service.update_issue(issue_key, update_data)
@@ -417,7 +524,42 @@ def update_issue(issue_key):
             return jsonify(result), 400
             
     except Exception as e:
-        print(f"Erro no endpoint de atualização: {e}")
+        logger.exception("Erro no endpoint de atualização de %s", issue_key)
+        return jsonify({
+            'success': False,
+            'message': f'Erro interno: {str(e)}'
+        }), 500
+
+@jira_bp.route('/issues/bulk', methods=['POST'])
+@cross_origin()
+def bulk_update_issues():
+    """Atualiza várias issues no Jira em paralelo.
+
+    Aceita {'updates': [{'key': ..., 'fields': {...}}, ...]} ou, para aplicar os
+    mesmos campos a várias issues, {'keys': [...], 'fields': {...}}.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        updates = data.get('updates')
+        if updates is None and isinstance(data.get('keys'), list):
+            updates = [{'key': key, 'fields': data.get('fields') or {}} for key in data['keys']]
+
+        if not isinstance(updates, list) or not updates or not all(isinstance(u, dict) for u in updates):
+            return jsonify({
+                'success': False,
+                'message': 'Nenhuma atualização fornecida'
+            }), 400
+        if len(updates) > BULK_MAX_UPDATES:
+            return jsonify({
+                'success': False,
+                'message': f'Máximo de {BULK_MAX_UPDATES} issues por lote'
+            }), 400
+
+        logger.info("Atualização em lote de %d issues", len(updates))
+        return jsonify(jira_service.bulk_update(updates)), 200
+
+    except Exception as e:
+        logger.exception("Erro no endpoint de atualização em lote")
         return jsonify({
             'success': False,
             'message': f'Erro interno: {str(e)}'
@@ -428,12 +570,12 @@ def update_issue(issue_key):
 def get_issue_transitions(issue_key):
     """Obtém transições disponíveis para uma issue"""
     try:
-        # Buscar transições disponíveis no Jira
-        transitions = jira_service._make_request(f'issue/{issue_key}/transitions')
+        # Transições em cache por (projeto, tipo, status); só chama o Jira na primeira vez
+        transitions = jira_service.get_transitions(issue_key)
         
         # Formatar resposta
         available_transitions = []
-        for transition in transitions.get('transitions', []):
+        for transition in transitions:
             available_transitions.append({
                 'id': transition['id'],
                 'name': transition['name'],
@@ -446,7 +588,7 @@ def get_issue_transitions(issue_key):
         })
         
     except Exception as e:
-        print(f"Erro ao buscar transições para {issue_key}: {e}")
+        logger.error("Erro ao buscar transições para %s: %s", issue_key, e)
         # Fallback com transições comuns
         return jsonify({
             'success': True,
@@ -0,0 +1,161 @@
+import csv
+import io
+import re
+import zipfile
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+from xml.sax.saxutils import escape
+
+# Linhas acumuladas antes de devolver um pedaço da resposta
+EXPORT_FLUSH_ROWS = 200
+
+# Mesmas colunas da planilha montada antes pelo frontend
+EXPORT_HEADERS = ['Chave', 'Resumo', 'Status', 'Tipo', 'Prioridade', 'Versão/Release', 'Responsável', 'Reporter', 'Criado', 'Atualizado']
+
+# Caracteres de controle não permitidos em XML 1.0
+_XML_INVALID = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Início de célula que o Excel interpreta como fórmula ao abrir um CSV
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _format_day(value) -> str:
+    if not value:
+        return ''
+    try:
+        return datetime.fromisoformat(str(value)[:10]).strftime('%d/%m/%Y')
+    except ValueError:
+        return str(value)
+
+
+def export_row(issue: Dict) -> List[str]:
+    """Converte uma issue nas colunas da exportação"""
+    fix_versions = issue.get('fix_versions') or []
+    return [
+        issue.get('jira_key') or '',
+        issue.get('summary') or '',
+        issue.get('status') or '',
+        issue.get('issue_type') or '',
+        issue.get('priority') or '',
+        '; '.join(fix_versions) if fix_versions else '-',
+        issue.get('assignee_name') or '',
+        issue.get('reporter_name') or '',
+        _format_day(issue.get('created_date')),
+        _format_day(issue.get('updated_date')),
+    ]
+
+
+def _csv_cell(value: str) -> str:
+    # Apóstrofo na frente faz a célula ser lida como texto, nunca como fórmula
+    # (o '-' sozinho, usado para "sem versão", não é fórmula)
+    if value != '-' and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(issues: Iterable[Dict]) -> Iterator[bytes]:
+    """CSV (UTF-8 com BOM, separado por ';' para o Excel em pt-BR) gerado em pedaços"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=';')
+    buffer.write('\ufeff')
+    writer.writerow(EXPORT_HEADERS)
+    pending = 0
+    for issue in issues:
+        writer.writerow([_csv_cell(value) for value in export_row(issue)])
+        pending += 1
+        if pending >= EXPORT_FLUSH_ROWS:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """Destino não posicionável do ZipFile; os bytes escritos são recolhidos em drain()"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Issues" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_END = '</sheetData></worksheet>'
+
+
+def _sheet_row(values: List[str]) -> str:
+    # Strings inline dispensam a tabela sharedStrings, que exigiria todas as linhas em memória
+    cells = ''.join(
+        f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_XML_INVALID.sub("", v))}</t></is></c>'
+        for v in values
+    )
+    return f'<row>{cells}</row>'
+
+
+def iter_xlsx(issues: Iterable[Dict]) -> Iterator[bytes]:
+    """Planilha XLSX mínima gerada em pedaços, sem montar o arquivo em memória"""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _ROOT_RELS)
+        archive.writestr('xl/workbook.xml', _WORKBOOK)
+        archive.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write((_SHEET_START + _sheet_row(EXPORT_HEADERS)).encode('utf-8'))
+            rows = []
+            for issue in issues:
+                rows.append(_sheet_row(export_row(issue)))
+                if len(rows) >= EXPORT_FLUSH_ROWS:
+                    sheet.write(''.join(rows).encode('utf-8'))
+                    rows = []
+                    yield sink.drain()
+            sheet.write((''.join(rows) + _SHEET_END).encode('utf-8'))
+    yield sink.drain()
+
+
+EXPORT_FORMATS = {
+    'csv': (iter_csv, 'text/csv; charset=utf-8'),
+    'xlsx': (iter_xlsx, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
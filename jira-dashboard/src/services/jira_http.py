@@ -0,0 +1,138 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.services.structured_log import get_logger
+
+logger = get_logger('http')
+
+# Timeouts (segundos) para conexão e leitura das chamadas ao Jira
+CONNECT_TIMEOUT = float(os.getenv('JIRA_CONNECT_TIMEOUT', '5'))
+READ_TIMEOUT = float(os.getenv('JIRA_READ_TIMEOUT', '30'))
+
+# Política de retentativas para 429 (rate limit) e 503 (indisponível)
+MAX_RETRIES = int(os.getenv('JIRA_MAX_RETRIES', '4'))
+BACKOFF_BASE = float(os.getenv('JIRA_BACKOFF_BASE', '0.5'))
+BACKOFF_MAX = float(os.getenv('JIRA_BACKOFF_MAX', '30'))
+
+# Tamanho do pool de conexões keep-alive por host do Jira
+POOL_SIZE = int(os.getenv('JIRA_POOL_SIZE', '16'))
+
+RETRY_STATUSES = (429, 503)
+# 503 só é retentado em métodos idempotentes; 429 indica que o Jira recusou a chamada
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE')
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+# Fim da pausa imposta por um 429, por host (time.monotonic()); vale para todas as threads
+_cooldowns: Dict[str, float] = {}
+_cooldowns_lock = threading.Lock()
+
+
+def _wait_cooldown(base_url: str) -> None:
+    with _cooldowns_lock:
+        until = _cooldowns.get(base_url, 0.0)
+    remaining = until - time.monotonic()
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+def _set_cooldown(base_url: str, delay: float) -> None:
+    with _cooldowns_lock:
+        _cooldowns[base_url] = max(_cooldowns.get(base_url, 0.0), time.monotonic() + delay)
+
+
+def get_session(base_url: str) -> requests.Session:
+    """Retorna a sessão HTTP compartilhada (pool keep-alive) do host do Jira"""
+    with _sessions_lock:
+        session = _sessions.get(base_url)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({
+                'Accept': 'application/json',
+                'Accept-Encoding': 'gzip, deflate'
+            })
+            _sessions[base_url] = session
+        return session
+
+
+class JiraTransport:
+    """Camada HTTP compartilhada pelas chamadas do JiraService"""
+
+    def __init__(self, base_url: str, auth_header: str,
+                 timeout: Optional[Tuple[float, float]] = None,
+                 max_retries: int = MAX_RETRIES):
+        self.base_url = base_url.rstrip('/')
+        self.session = get_session(self.base_url)
+        self.headers = {
+            'Authorization': auth_header,
+            'Content-Type': 'application/json'
+        }
+        self.timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+        self.max_retries = max_retries
+
+    def request(self, method: str, endpoint: str, params: Dict = None, json_body: Dict = None) -> requests.Response:
+        """Executa a requisição com timeout e backoff em 429/503"""
+        url = f"{self.base_url}/rest/api/3/{endpoint}"
+        method = method.upper()
+        attempt = 0
+        while True:
+            # Um 429 recebido por qualquer thread pausa as demais chamadas ao mesmo host
+            _wait_cooldown(self.base_url)
+            response = self.session.request(
+                method, url,
+                headers=self.headers,
+                params=params,
+                json=json_body,
+                timeout=self.timeout
+            )
+            if not self._should_retry(method, response.status_code) or attempt >= self.max_retries:
+                return response
+
+            delay = self._retry_delay(response, attempt)
+            if response.status_code == 429:
+                _set_cooldown(self.base_url, delay)
+            logger.warning(
+                "%s em %s %s, nova tentativa em %.1fs (%d/%d)",
+                response.status_code, method, endpoint, delay, attempt + 1, self.max_retries,
+                extra={'fields': {'status': response.status_code, 'endpoint': endpoint, 'retry_in': round(delay, 2)}}
+            )
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _should_retry(self, method: str, status_code: int) -> bool:
+        if status_code == 429:
+            return True
+        return status_code in RETRY_STATUSES and method in IDEMPOTENT_METHODS
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """Respeita Retry-After quando presente; senão backoff exponencial com jitter"""
+        retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
+        if retry_after is not None:
+            return min(retry_after, BACKOFF_MAX) + random.uniform(0, BACKOFF_BASE)
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After pode vir em segundos ou como data HTTP"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
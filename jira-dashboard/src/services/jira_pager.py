@@ -0,0 +1,150 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional
+
+from src.services.snapshot_cache import SnapshotCache, normalize_jql
+from src.services.structured_log import get_logger, submit_in_context
+
+logger = get_logger('search')
+
+# 'offset' usa /search com startAt (servidores antigos); 'token' usa /search/jql com nextPageToken
+SEARCH_API = os.getenv('JIRA_SEARCH_API', 'offset').lower()
+
+
+class OffsetPager:
+    """Paginação por startAt em /rest/api/3/search.
+
+    A primeira página informa o total; as demais são buscadas em paralelo
+    com no máximo `fetch_workers` requisições em andamento.
+    """
+
+    def __init__(self, get: Callable, post: Callable, fetch_workers: int):
+        self._get = get
+        self.fetch_workers = fetch_workers
+
+    def page(self, jql: str, start_at: int, max_results: int, fields: str) -> Dict:
+        """Uma página da busca: {'issues': [...], 'total': n}"""
+        return self._get('search', {
+            'jql': jql,
+            'startAt': start_at,
+            'maxResults': max_results,
+            'fields': fields
+        })
+
+    def pages(self, jql: str, fields: str, page_size: int) -> Iterator[List[Dict]]:
+        """Todas as páginas da JQL, em ordem"""
+        data = self.page(jql, 0, page_size, fields)
+        total = data.get('total', 0)
+        logger.debug("Página processada. start_at: 0, issues nesta página: %d, total no Jira: %d", len(data.get('issues', [])), total)
+        yield data.get('issues', [])
+
+        offsets = list(range(page_size, total, page_size))
+        if not offsets:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.fetch_workers, len(offsets))) as executor:
+            pending = deque()
+            next_offset = iter(offsets)
+            for start_at in islice(next_offset, self.fetch_workers):
+                pending.append((start_at, submit_in_context(executor, self.page, jql, start_at, page_size, fields)))
+            while pending:
+                start_at, future = pending.popleft()
+                page = future.result()
+                # Mantém a janela de requisições cheia enquanto a página atual é consumida
+                for next_start in islice(next_offset, 1):
+                    pending.append((next_start, submit_in_context(executor, self.page, jql, next_start, page_size, fields)))
+                issues = page.get('issues', [])
+                logger.debug("Página processada. start_at: %d, issues nesta página: %d, total no Jira: %d", start_at, len(issues), total)
+                yield issues
+
+    def count(self, jql: str) -> int:
+        return self._get('search', {'jql': jql, 'maxResults': 0, 'fields': 'none'}).get('total', 0)
+
+
+class TokenPager:
+    """Paginação por nextPageToken em /rest/api/3/search/jql.
+
+    Cada página depende do token da anterior, então a varredura é
+    sequencial; a próxima página é pedida enquanto a atual é consumida.
+    O endpoint não informa total, que vem de /search/approximate-count e fica
+    em cache por JQL normalizada, para não custar um POST a cada página.
+    """
+
+    def __init__(self, get: Callable, post: Callable, fetch_workers: int):
+        self._get = get
+        self._post = post
+        # Tokens já vistos por (jql, tamanho de página), para acessar páginas avulsas sem recomeçar do início
+        self._tokens = SnapshotCache()
+        self._tokens_lock = threading.Lock()
+        # Total aproximado por JQL normalizada, informado junto com cada página
+        self._totals = SnapshotCache()
+
+    def _fetch(self, jql: str, max_results: int, fields: str, token: Optional[str]) -> Dict:
+        params = {'jql': jql, 'maxResults': max_results, 'fields': fields}
+        if token:
+            params['nextPageToken'] = token
+        return self._get('search/jql', params)
+
+    def _next_token(self, data: Dict) -> Optional[str]:
+        if data.get('isLast') or not data.get('issues'):
+            return None
+        return data.get('nextPageToken')
+
+    def page(self, jql: str, start_at: int, max_results: int, fields: str) -> Dict:
+        """Uma página da busca: {'issues': [...], 'total': n}"""
+        index = start_at // max_results
+        key = (normalize_jql(jql), max_results)
+        tokens = self._tokens.get_or_load(key, lambda: [None])
+        # Avança a partir do token conhecido mais próximo, pedindo só o id das páginas puladas
+        position = min(index, len(tokens) - 1)
+        while position < index:
+            data = self._fetch(jql, max_results, 'id', tokens[position])
+            token = self._next_token(data)
+            if token is None:
+                return {'issues': [], 'total': self._total(jql)}
+            position += 1
+            with self._tokens_lock:
+                if len(tokens) == position:
+                    tokens.append(token)
+        data = self._fetch(jql, max_results, fields, tokens[index])
+        token = self._next_token(data)
+        with self._tokens_lock:
+            if token is not None and len(tokens) == index + 1:
+                tokens.append(token)
+        return {'issues': data.get('issues', []), 'total': self._total(jql)}
+
+    def _total(self, jql: str) -> int:
+        return self._totals.get_or_load(normalize_jql(jql), lambda: self.count(jql))
+
+    def pages(self, jql: str, fields: str, page_size: int) -> Iterator[List[Dict]]:
+        """Todas as páginas da JQL, em ordem"""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            data = self._fetch(jql, page_size, fields, None)
+            page_number = 0
+            while True:
+                token = self._next_token(data)
+                future = submit_in_context(executor, self._fetch, jql, page_size, fields, token) if token else None
+                issues = data.get('issues', [])
+                logger.debug("Página processada. página: %d, issues nesta página: %d", page_number, len(issues))
+                yield issues
+                if future is None:
+                    return
+                data = future.result()
+                page_number += 1
+
+    def count(self, jql: str) -> int:
+        return self._post('search/approximate-count', {'jql': jql}).get('count', 0)
+
+
+PAGERS = {
+    'offset': OffsetPager,
+    'token': TokenPager,
+}
+
+
+def make_pager(get: Callable, post: Callable, fetch_workers: int, search_api: str = SEARCH_API):
+    """Instancia o paginador configurado em JIRA_SEARCH_API"""
+    return PAGERS.get(search_api, OffsetPager)(get, post, fetch_workers)
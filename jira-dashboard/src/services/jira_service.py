@@ -1,16 +1,416 @@
 import requests
 import base64
 import json
+import logging
+import math
+import os
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from src.models.jira import JiraIssue, db
+from typing import Iterable, Iterator, List, Dict, Optional
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from src.models.jira import JiraDailyRollup, JiraIssue, JiraIssueVersion, JiraProject, JiraVersion, JiraSyncState, db
+from src.services.jira_http import JiraTransport
+from src.services.jira_pager import make_pager
+from src.services.snapshot_cache import SnapshotCache, normalize_jql
+from src.services.structured_log import get_logger, log_sampled, submit_in_context
+
+logger = get_logger('service')
+
+# Tamanho de página das buscas fetch_all (limite do Jira Cloud)
+PAGE_SIZE = 100
+# Número máximo de páginas buscadas em paralelo
+FETCH_WORKERS = int(os.getenv('JIRA_FETCH_WORKERS', '4'))
+# Janela de sobreposição do sync incremental, cobre a precisão de minutos da JQL
+SYNC_OVERLAP_MINUTES = int(os.getenv('JIRA_SYNC_OVERLAP_MINUTES', '10'))
+# Status considerados resolvidos mesmo sem resolutiondate
+RESOLVED_STATUSES = ['done', 'concluído', 'concluído.', 'cancelado', 'itens concluídos', 'resolved', 'fechado', 'closed']
+# Variações de prioridade do Jira agrupadas nas faixas do Backlog Aging
+PRIORITY_BUCKETS = {
+    'Critical': ['critical', 'highest', 'blocker'],
+    'High': ['high', 'major'],
+    'Medium': ['medium', 'normal'],
+    'Low': ['low', 'minor', 'lowest'],
+}
+# Faixas do Backlog Aging e o maior número de dias em aberto de cada uma (a última não tem limite)
+AGING_RANGES = ['0-5 dias', '6-15 dias', '16-30 dias', 'Mais de 30 dias']
+AGING_LIMITS = [5, 15, 30]
+AGING_PRIORITIES = ['Critical', 'High', 'Medium', 'Low', 'Sem prioridade']
+# Quantidade de issues gravadas por INSERT/commit durante o sync
+UPSERT_CHUNK_SIZE = int(os.getenv('JIRA_UPSERT_CHUNK_SIZE', '500'))
+# Campos pedidos ao Jira por perfil: agregações não usam summary nem a
+# descrição (ADF), e a tabela de issues não exibe a descrição
+AGGREGATE_FIELDS = 'project,status,issuetype,priority,assignee,reporter,created,updated,resolutiondate,fixVersions,versions'
+FIELD_PROFILES = {
+    'aggregate': AGGREGATE_FIELDS,
+    'table': 'summary,' + AGGREGATE_FIELDS,
+    'detail': 'summary,description,' + AGGREGATE_FIELDS,
+}
+# Contagens em janela de 30 dias do card de estatísticas, expressas em JQL.
+# O Jira não conhece a lista RESOLVED_STATUSES; a categoria Done faz esse papel aqui.
+COUNT_WINDOWS = {
+    'recent_issues': 'created >= -30d',
+    'resolved_issues': '(resolved >= -30d OR (statusCategory = Done AND updated >= -30d))',
+}
+# Tempo de vida (segundos) do cache de transições por (projeto, tipo, status de origem)
+TRANSITION_TTL = float(os.getenv('JIRA_TRANSITION_TTL', '3600'))
+# Tempo de vida (segundos) das opções de filtro montadas a partir dos metadados do projeto
+METADATA_TTL = float(os.getenv('JIRA_METADATA_TTL', '900'))
+# Usuários por página em user/assignable/search e user/permission/search (limite do Jira)
+USERS_PAGE_SIZE = 1000
+# Edições simultâneas numa atualização em lote e tamanho máximo do lote
+BULK_WORKERS = int(os.getenv('JIRA_BULK_WORKERS', '4'))
+BULK_MAX_UPDATES = int(os.getenv('JIRA_BULK_MAX_UPDATES', '500'))
+ISSUE_KEY_RE = re.compile(r'^[A-Z][A-Z0-9_]*-\d+$')
+# Do mais enxuto para o mais completo; um snapshot serve aos perfis anteriores a ele
+PROFILE_ORDER = ('aggregate', 'table', 'detail')
+
+class JiraAPIError(Exception):
+    """Resposta de erro da API do Jira em chamadas de escrita"""
+
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"Erro na API do Jira: {status_code} - {text}")
+        self.status_code = status_code
+
+def normalize_priority(priority: Optional[str]) -> str:
+    """Normaliza a prioridade do Jira para Critical/High/Medium/Low/Sem prioridade"""
+    priority_normalized = priority.lower() if priority else ''
+    for bucket, names in PRIORITY_BUCKETS.items():
+        if priority_normalized in names:
+            return bucket
+    return 'Sem prioridade'
+
+def parse_jira_date(value) -> Optional[datetime]:
+    """Converte data/hora do Jira ('2024-01-31T10:00:00.000-0300') em datetime com fuso"""
+    if not value:
+        return None
+    try:
+        # fromisoformat aceita o formato do Jira (offset sem ':') a partir do Python 3.11
+        dt = datetime.fromisoformat(value)
+        return dt if dt.tzinfo else None
+    except ValueError:
+        pass
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+def merge_filter_options(metadata: Dict, from_issues: Dict) -> Dict:
+    """Opções dos metadados do projeto acrescidas dos valores que só aparecem nas issues"""
+    merged = {}
+    for facet in ('statuses', 'types', 'priorities', 'versions'):
+        merged[facet] = sorted(set(metadata.get(facet, [])) | set(from_issues.get(facet, [])))
+    for facet in ('assignees', 'reporters'):
+        people = {person['id']: person for person in metadata.get(facet, [])}
+        for person in from_issues.get(facet, []):
+            people.setdefault(person['id'], person)
+        merged[facet] = sorted(people.values(), key=lambda person: (person['name'] or '').lower())
+    return merged
+
+class IssueSnapshot(list):
+    """Issues de um snapshot e sua visão em colunas.
+
+    Snapshots vindos de uma varredura já trazem as colunas, montadas página a
+    página; os demais as montam na primeira agregação.
+    """
+
+    def __init__(self, issues=(), columns: Optional['IssueColumns'] = None):
+        super().__init__(issues)
+        self.columns = columns
+
+    def replaced(self, edited: Dict[str, Dict]) -> 'IssueSnapshot':
+        """Cópia com as issues editadas trocadas, sem reconverter as demais"""
+        issues = list(self)
+        positions = {}
+        for position, issue in enumerate(issues):
+            replacement = edited.get(issue.get('jira_key'))
+            if replacement is not None:
+                issues[position] = positions[position] = replacement
+        columns = self.columns.patched(positions) if self.columns is not None else None
+        return IssueSnapshot(issues, columns)
+
+class IssueColumns:
+    """Issues em colunas, para estatísticas e timeline sem percorrer dicionários.
+
+    Campos categóricos viram códigos inteiros (array) com a lista de rótulos
+    na ordem em que apareceram; datas são convertidas uma única vez, ao
+    entrar, em timestamps (NaN se ausentes) e no dia de calendário de cada
+    uma, no fuso da própria data. As agregações são contagens sobre esses arrays.
+    """
+
+    CATEGORIES = {
+        'status': 'Desconhecido',
+        'issue_type': 'Desconhecido',
+        'priority': 'Desconhecido',
+        'assignee_name': 'Não atribuído',
+        'reporter_name': 'Não atribuído',
+    }
+    DATES = ('created', 'updated', 'resolved')
+    NO_VERSION = 'Não atribuído'
+
+    def __init__(self, issues: Iterable[Dict] = ()):
+        self._index = {field: {} for field in list(self.CATEGORIES) + ['fix_versions']}
+        # Chave de cada linha, para trocar issues editadas sem os dicionários
+        self.keys: List[str] = []
+        # id (ou nome) -> nome das pessoas, para as opções de filtro
+        self.people = {'assignee': {}, 'reporter': {}}
+        self.codes = {field: array('I') for field in self._index}
+        # Issue i tem as versões version_codes[version_offsets[i]:version_offsets[i + 1]]
+        self.version_offsets = array('I', [0])
+        self.timestamps = {name: array('d') for name in self.DATES}
+        self.days = {name: array('l') for name in self.DATES}
+        self.extend(issues)
+
+    @property
+    def size(self) -> int:
+        return len(self.timestamps['created'])
+
+    def labels(self, field: str) -> List[str]:
+        return list(self._index[field])
+
+    def extend(self, issues: Iterable[Dict]) -> None:
+        """Acrescenta issues (uma página, por exemplo), convertendo cada data uma vez"""
+        for issue in issues:
+            self._append_row(issue)
+
+    def _row_values(self, issue: Dict):
+        categories = [
+            self._index[field].setdefault(issue.get(field) or default, len(self._index[field]))
+            for field, default in self.CATEGORIES.items()
+        ]
+        versions = self._index['fix_versions']
+        version_codes = [versions.setdefault(v, len(versions)) for v in self._version_names(issue.get('fix_versions'))]
+        dates = [
+            self._date(issue.get(key))
+            for key in ('created_date', 'updated_date', 'resolution_date')
+        ]
+        for role, people in self.people.items():
+            name = issue.get(f'{role}_name')
+            if name:
+                people[issue.get(f'{role}_id') or name] = name
+        return categories, version_codes, dates
+
+    def _append_row(self, issue: Dict) -> None:
+        categories, version_codes, dates = self._row_values(issue)
+        self.keys.append(issue.get('jira_key'))
+        for field, code in zip(self.CATEGORIES, categories):
+            self.codes[field].append(code)
+        self.codes['fix_versions'].extend(version_codes)
+        self.version_offsets.append(len(self.codes['fix_versions']))
+        for name, (timestamp, day) in zip(self.DATES, dates):
+            self.timestamps[name].append(timestamp)
+            self.days[name].append(day)
+
+    @staticmethod
+    def _date(value):
+        dt = parse_jira_date(value) if isinstance(value, str) else value
+        return (dt.timestamp(), dt.toordinal()) if dt else (math.nan, 0)
+
+    @classmethod
+    def _version_names(cls, fix_versions) -> List[str]:
+        # Pode ser lista, string JSON ou string simples
+        if isinstance(fix_versions, str):
+            try:
+                fix_versions = json.loads(fix_versions)
+            except Exception:
+                fix_versions = [fix_versions]
+        if not fix_versions:
+            return [cls.NO_VERSION]
+        return [v or cls.NO_VERSION for v in fix_versions]
+
+    def _empty_copy(self) -> 'IssueColumns':
+        columns = IssueColumns()
+        columns._index = {field: dict(index) for field, index in self._index.items()}
+        columns.people = {role: dict(people) for role, people in self.people.items()}
+        return columns
+
+    def select(self, positions: Iterable[int]) -> 'IssueColumns':
+        """Colunas só com as issues nas posições dadas, sem reconverter nada"""
+        positions = list(positions)
+        columns = self._empty_copy()
+        columns.keys = [self.keys[p] for p in positions]
+        for field in self.CATEGORIES:
+            source = self.codes[field]
+            columns.codes[field] = array('I', (source[p] for p in positions))
+        for name in self.DATES:
+            timestamps, days = self.timestamps[name], self.days[name]
+            columns.timestamps[name] = array('d', (timestamps[p] for p in positions))
+            columns.days[name] = array('l', (days[p] for p in positions))
+        offsets = self.version_offsets
+        for p in positions:
+            columns.codes['fix_versions'].extend(self.codes['fix_versions'][offsets[p]:offsets[p + 1]])
+            columns.version_offsets.append(len(columns.codes['fix_versions']))
+        return columns
+
+    def with_version(self, name: str) -> 'IssueColumns':
+        """Colunas só com as issues que têm a fix_version (nome já em minúsculas)"""
+        wanted = {
+            code for label, code in self._index['fix_versions'].items()
+            if label != self.NO_VERSION and label.strip().lower() == name
+        }
+        codes, offsets = self.codes['fix_versions'], self.version_offsets
+        return self.select(
+            position for position in range(self.size)
+            if any(code in wanted for code in codes[offsets[position]:offsets[position + 1]])
+        )
+
+    def replaced(self, edited: Dict[str, Dict]) -> 'IssueColumns':
+        """Cópia com as issues editadas (por chave) reconvertidas"""
+        return self.patched({
+            position: edited[key] for position, key in enumerate(self.keys) if key in edited
+        })
+
+    def patched(self, replacements: Dict[int, Dict]) -> 'IssueColumns':
+        """Cópia com as linhas dadas reconvertidas a partir das issues editadas"""
+        columns = self._empty_copy()
+        columns.keys = list(self.keys)
+        columns.codes = {field: array('I', codes) for field, codes in self.codes.items()}
+        columns.version_offsets = array('I', self.version_offsets)
+        columns.timestamps = {name: array('d', values) for name, values in self.timestamps.items()}
+        columns.days = {name: array('l', values) for name, values in self.days.items()}
+        for position, issue in sorted(replacements.items()):
+            categories, version_codes, dates = columns._row_values(issue)
+            for field, code in zip(self.CATEGORIES, categories):
+                columns.codes[field][position] = code
+            for name, (timestamp, day) in zip(self.DATES, dates):
+                columns.timestamps[name][position] = timestamp
+                columns.days[name][position] = day
+            offsets = columns.version_offsets
+            start, end = offsets[position], offsets[position + 1]
+            columns.codes['fix_versions'][start:end] = array('I', version_codes)
+            shift = len(version_codes) - (end - start)
+            if shift:
+                for i in range(position + 1, len(offsets)):
+                    offsets[i] += shift
+        return columns
+
+    def filter_options(self) -> Dict:
+        """Valores distintos de status, tipo, prioridade, pessoas e versões das issues"""
+        def present(field: str, missing: str) -> List[str]:
+            used = set(self.codes[field])
+            return sorted(label for label, code in self._index[field].items() if code in used and label != missing)
+
+        return {
+            'statuses': present('status', self.CATEGORIES['status']),
+            'types': present('issue_type', self.CATEGORIES['issue_type']),
+            'priorities': present('priority', self.CATEGORIES['priority']),
+            'assignees': [{'id': k, 'name': v} for k, v in self.people['assignee'].items()],
+            'reporters': [{'id': k, 'name': v} for k, v in self.people['reporter'].items()],
+            'versions': present('fix_versions', self.NO_VERSION)
+        }
+
+    def distribution(self, field: str) -> List[tuple]:
+        """(rótulo, quantidade) na ordem em que os rótulos aparecem nas issues"""
+        labels = self.labels(field)
+        # Counter preserva a ordem da primeira ocorrência de cada código
+        return [(labels[code], count) for code, count in Counter(self.codes[field]).items()]
+
+    def backlog_aging(self, now: float) -> Dict[str, Dict[str, int]]:
+        """Issues abertas (sem resolução) por faixa de dias em aberto e prioridade normalizada"""
+        buckets = [normalize_priority('' if label == 'Desconhecido' else label) for label in self.labels('priority')]
+        ranges = Counter(
+            (bisect_left(AGING_LIMITS, (now - created) // 86400), buckets[priority])
+            for created, resolved, priority in zip(self.timestamps['created'], self.timestamps['resolved'], self.codes['priority'])
+            if math.isnan(resolved) and not math.isnan(created)
+        )
+        aging = {label: {bucket: 0 for bucket in AGING_PRIORITIES} for label in AGING_RANGES}
+        for (index, bucket), count in ranges.items():
+            aging[AGING_RANGES[index]][bucket] += count
+        return aging
+
+    def stats(self) -> Dict:
+        today = datetime.now(datetime.utcnow().astimezone().tzinfo)
+        now = today.timestamp()
+        cutoff = (today - timedelta(days=30)).timestamp()
+        done = [label.strip().lower() in RESOLVED_STATUSES for label in self.labels('status')]
+
+        recent_issues = sum(1 for created in self.timestamps['created'] if created >= cutoff)
+        # Considera resolvida se tem resolution_date recente ou status de conclusão e updated_date recente
+        resolved_issues = sum(
+            1 for resolved, status, updated in zip(self.timestamps['resolved'], self.codes['status'], self.timestamps['updated'])
+            if resolved >= cutoff or (done[status] and updated >= cutoff)
+        )
+
+        # Incluir todas as faixas, mesmo com zero, para o gráfico renderizar
+        backlog_aging_formatted = [
+            {
+                'time_range': time_range,
+                'total': sum(priorities.values()),
+                'critical': priorities['Critical'],
+                'high': priorities['High'],
+                'medium': priorities['Medium'],
+                'low': priorities['Low'],
+                'no_priority': priorities['Sem prioridade']
+            }
+            for time_range, priorities in self.backlog_aging(now).items()
+        ]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Backlog aging: %d issues abertas de %d, %d resolvidas; %s",
+                sum(item['total'] for item in backlog_aging_formatted), self.size, resolved_issues,
+                ', '.join(f"{item['time_range']}={item['total']}" for item in backlog_aging_formatted)
+            )
+
+        return {
+            'total_issues': self.size,
+            'recent_issues': recent_issues,
+            'resolved_issues': resolved_issues,
+            'status_distribution': [{'status': k, 'count': v} for k, v in self.distribution('status')],
+            'type_distribution': [{'type': k, 'count': v} for k, v in self.distribution('issue_type')],
+            'priority_distribution': [{'priority': k, 'count': v} for k, v in self.distribution('priority')],
+            'assignee_distribution': [{'assignee': k, 'count': v} for k, v in self.distribution('assignee_name')],
+            'reporter_distribution': [{'reporter': k, 'count': v} for k, v in self.distribution('reporter_name')],
+            'version_distribution': [{'version': k, 'count': v} for k, v in self.distribution('fix_versions')],
+            'backlog_aging': backlog_aging_formatted
+        }
+
+    def timeline(self, days: int = 30) -> Dict:
+        created_counts = Counter(self.days['created'])
+        resolved_counts = Counter(self.days['resolved'])
+        created_timeline = []
+        resolved_timeline = []
+        # Gerar timeline para os últimos N dias
+        for i in range(days):
+            date = (datetime.now() - timedelta(days=days-i-1)).date()
+            date_str = date.strftime('%Y-%m-%d')
+            created_timeline.append({'date': date_str, 'count': created_counts.get(date.toordinal(), 0)})
+            resolved_timeline.append({'date': date_str, 'count': resolved_counts.get(date.toordinal(), 0)})
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Timeline de %d dias: %d criadas, %d resolvidas", days,
+                sum(item['count'] for item in created_timeline), sum(item['count'] for item in resolved_timeline)
+            )
+
+        return {
+            'created_timeline': created_timeline,
+            'resolved_timeline': resolved_timeline
+        }
 
 class JiraService:
-    def __init__(self, base_url: str, email: str, api_token: str):
+    def __init__(self, base_url: str, email: str, api_token: str, fetch_workers: int = FETCH_WORKERS):
         self.base_url = base_url.rstrip('/')
         self.email = email
         self.api_token = api_token
+        self.fetch_workers = max(1, fetch_workers)
         self.auth_header = self._create_auth_header()
+        self.transport = JiraTransport(self.base_url, self.auth_header)
+        # Snapshots de buscas fetch_all compartilhados entre endpoints e usuários
+        self.snapshots = SnapshotCache()
+        # Transições do workflow, que dependem só de projeto, tipo e status atual
+        self.transitions = SnapshotCache(ttl=TRANSITION_TTL, max_entries=512)
+        # Opções de filtro por projeto, vindas dos endpoints de metadados
+        self.metadata = SnapshotCache(ttl=METADATA_TTL, max_entries=256)
+        # startAt em /search ou nextPageToken em /search/jql, conforme JIRA_SEARCH_API
+        self.pager = make_pager(self._make_request, self._make_request_post, self.fetch_workers)
         
     def _create_auth_header(self) -> str:
         """Cria o header de autenticação Basic Auth"""
@@ -21,18 +421,12 @@ class JiraService:
     def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
         """Faz uma requisição para a API do Jira"""
         url = f"{self.base_url}/rest/api/3/{endpoint}"
-        headers = {
-            'Authorization': self.auth_header,
-            'Accept': 'application/json',
-            'Content-Type': 'application/json'
-        }
-        
         try:
-            response = requests.get(url, headers=headers, params=params)
+            response = self.transport.request('GET', endpoint, params=params)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Erro na requisição para {url}: {e}")
+            logger.error("Erro na requisição para %s: %s", url, e)
             raise e
     
     def get_projects(self) -> List[Dict]:
@@ -55,7 +449,7 @@ class JiraService:
             
             return projects
         except Exception as e:
-            print(f"Erro ao buscar projetos: {e}")
+            logger.error("Erro ao buscar projetos: %s", e)
             return []
     
     def get_project_versions(self, project_key: str) -> List[Dict]:
@@ -75,98 +469,151 @@ class JiraService:
             
             return versions
         except Exception as e:
-            print(f"Erro ao buscar versões do projeto {project_key}: {e}")
+            logger.error("Erro ao buscar versões do projeto %s: %s", project_key, e)
             return []
     
-    def get_issues(self, filters: Dict, page: int = 1, per_page: int = 50, fetch_all: bool = False) -> Dict:
+    def _build_jql(self, filters: Dict) -> str:
+        """Monta a JQL a partir do dicionário de filtros"""
+        jql_parts = []
+        if 'project' in filters:
+            jql_parts.append(f"project = {filters['project']}")
+        if 'status' in filters:
+            jql_parts.append(f"status = '{filters['status']}'")
+        if 'assignee' in filters:
+            jql_parts.append(f"assignee = '{filters['assignee']}'")
+        if 'reporter' in filters:
+            jql_parts.append(f"reporter = '{filters['reporter']}'")
+        if 'issuetype' in filters:
+            jql_parts.append(f"issuetype = '{filters['issuetype']}'")
+        if 'priority' in filters:
+            jql_parts.append(f"priority = '{filters['priority']}'")
+        if 'created' in filters:
+            jql_parts.append(filters['created'])
+        if 'created_after' in filters:
+            jql_parts.append(f"created >= '{filters['created_after']}'")
+        if 'created_before' in filters:
+            jql_parts.append(f"created <= '{filters['created_before']}'")
+        if 'fix_version' in filters:
+            # Escapa aspas simples no valor
+            fix_version_value = filters['fix_version'].replace("'", "\\'")
+            jql_parts.append(f"fixVersion = '{fix_version_value}'")
+        return ' AND '.join(jql_parts)
+
+    def _parse_issue(self, issue: Dict) -> Dict:
+        """Converte uma issue da API do Jira para o formato usado pelo dashboard"""
+        fields = issue.get('fields', {})
+        assignee_obj = fields.get('assignee')
+        reporter_obj = fields.get('reporter')
+        return {
+            'id': issue.get('id'),
+            'jira_key': issue.get('key'),
+            'jira_id': issue.get('id'),
+            'summary': fields.get('summary', ''),
+            'description': fields.get('description', ''),
+            'project_key': issue.get('key', '').split('-')[0] if issue.get('key') else '',
+            'project_name': '',
+            'status': (fields.get('status') or {}).get('name', ''),
+            'issue_type': (fields.get('issuetype') or {}).get('name', ''),
+            'priority': (fields.get('priority') or {}).get('name', ''),
+            'assignee_name': (assignee_obj or {}).get('displayName', '') if assignee_obj else '',
+            'assignee_id': (assignee_obj or {}).get('accountId', '') if assignee_obj else '',
+            'reporter_name': (reporter_obj or {}).get('displayName', '') if reporter_obj else '',
+            'reporter_id': (reporter_obj or {}).get('accountId', '') if reporter_obj else '',
+            'created_date': fields.get('created', ''),
+            'updated_date': fields.get('updated', ''),
+            'resolution_date': fields.get('resolutiondate', ''),
+            'fix_version': ', '.join([v['name'] for v in fields.get('fixVersions', []) if v.get('name')]) or '',
+            'fix_versions': [v['name'] for v in fields.get('fixVersions', []) if v.get('name')],
+            'affected_versions': [v['name'] for v in fields.get('versions', []) if v.get('name')],
+        }
+
+    def _search_page(self, jql: str, start_at: int, max_results: int, profile: str = 'detail') -> Dict:
+        """Busca uma página da pesquisa JQL com os campos do perfil"""
+        return self.pager.page(jql, start_at, max_results, FIELD_PROFILES[profile])
+
+    def _iter_issue_pages(self, jql: str, profile: str = 'detail') -> Iterator[List[Dict]]:
+        """Percorre todas as páginas da JQL, em ordem, já convertidas"""
+        for issues in self.pager.pages(jql, FIELD_PROFILES[profile], PAGE_SIZE):
+            yield [self._parse_issue(issue) for issue in issues]
+
+    def _scan_issues(self, jql: str, profile: str = 'detail') -> IssueSnapshot:
+        """Busca todas as issues da JQL diretamente no Jira, montando as colunas a cada página"""
+        snapshot = IssueSnapshot(columns=IssueColumns())
+        for issues in self._iter_issue_pages(jql, profile):
+            snapshot.extend(issues)
+            snapshot.columns.extend(issues)
+        return snapshot
+
+    def _scan_columns(self, jql: str) -> IssueColumns:
+        """Busca todas as issues da JQL no perfil de agregação guardando só as colunas"""
+        columns = IssueColumns()
+        for issues in self._iter_issue_pages(jql, 'aggregate'):
+            columns.extend(issues)
+        return columns
+
+    def _fetch_snapshot(self, jql: str, profile: str = 'table') -> List[Dict]:
+        """Retorna todas as issues da JQL, reaproveitando scans recentes ou em andamento.
+
+        Um snapshot de perfil mais completo já em cache também atende ao perfil pedido.
+        O perfil de agregação fica só em colunas (_fetch_columns), então pedidos de
+        issues nesse perfil são atendidos pelo table.
+        """
+        if profile == 'aggregate':
+            profile = 'table'
+        key = normalize_jql(jql)
+        for wider in PROFILE_ORDER[PROFILE_ORDER.index(profile) + 1:]:
+            cached = self.snapshots.get((wider, key))
+            if cached is not None:
+                return cached
+        return self.snapshots.get_or_load((profile, key), lambda: self._scan_issues(jql, profile))
+
+    def _fetch_columns(self, jql: str) -> IssueColumns:
+        """Colunas de todas as issues da JQL, sem manter os dicionários em cache.
+
+        Um snapshot de issues já em cache (table ou detail) é reaproveitado.
+        """
+        key = normalize_jql(jql)
+        for wider in PROFILE_ORDER[1:]:
+            cached = self.snapshots.get((wider, key))
+            if cached is not None:
+                return self._columns(cached)
+        return self.snapshots.get_or_load(('aggregate', key), lambda: self._scan_columns(jql))
+
+    def _columns(self, issues: List[Dict]) -> IssueColumns:
+        """Visão em colunas das issues; a de um snapshot é montada uma vez e reaproveitada"""
+        if not isinstance(issues, IssueSnapshot):
+            return IssueColumns(issues)
+        if issues.columns is None:
+            issues.columns = IssueColumns(issues)
+        return issues.columns
+
+    def _aggregate_columns(self, filters: Dict) -> IssueColumns:
+        """Colunas das issues dos filtros, restritas à fix_version se houver"""
+        columns = self._fetch_columns(self._build_jql(filters))
+        if 'fix_version' not in filters:
+            return columns
+        return columns.with_version(filters['fix_version'].strip().lower())
+
+    def _search_issues_page(self, jql: str, page: int, per_page: int, profile: str = 'table') -> tuple:
+        """(issues convertidas, total) de uma página da JQL, direto no Jira"""
+        data = self._search_page(jql, (page - 1) * per_page, per_page, profile)
+        return [self._parse_issue(issue) for issue in data.get('issues', [])], data.get('total', 0)
+
+    def get_issues(self, filters: Dict, page: int = 1, per_page: int = 50, fetch_all: bool = False,
+                   profile: str = 'table') -> Dict:
         try:
-            # LOG: Debug dos filtros recebidos
-            if fetch_all:
-                print(f"[JIRA SERVICE] get_issues chamado com filtros: {filters}")
-                print(f"[JIRA SERVICE] fetch_all: {fetch_all}")
-            
-            jql_parts = []
-            if 'project' in filters:
-                jql_parts.append(f"project = {filters['project']}")
-            if 'status' in filters:
-                jql_parts.append(f"status = '{filters['status']}'")
-            if 'assignee' in filters:
-                jql_parts.append(f"assignee = '{filters['assignee']}'")
-            if 'reporter' in filters:
-                jql_parts.append(f"reporter = '{filters['reporter']}'")
-            if 'issuetype' in filters:
-                jql_parts.append(f"issuetype = '{filters['issuetype']}'")
-            if 'priority' in filters:
-                jql_parts.append(f"priority = '{filters['priority']}'")
-            if 'created' in filters:
-                jql_parts.append(filters['created'])
-            if 'fix_version' in filters:
-                # Escapa aspas simples no valor
-                fix_version_value = filters['fix_version'].replace("'", "\\'")
-                jql_parts.append(f"fixVersion = '{fix_version_value}'")
-                if fetch_all:
-                    print(f"[JIRA SERVICE] Filtro fix_version adicionado ao JQL: fixVersion = '{fix_version_value}'")
-            jql = ' AND '.join(jql_parts)
-            
-            if fetch_all:
-                print(f"[JIRA SERVICE] JQL final: {jql}")
+            jql = self._build_jql(filters)
 
-            all_issues = []
-            total = 0
             if fetch_all:
-                start_at = 0
-                while True:
-                    params = {
-                        'jql': jql,
-                        'startAt': start_at,
-                        'maxResults': 100,
-                        'fields': 'summary,description,project,status,issuetype,priority,assignee,reporter,created,updated,resolutiondate,fixVersions'
-                    }
-                    data = self._make_request('search', params)
-                    issues = []
-                    for issue in data.get('issues', []):
-                        fields = issue.get('fields', {})
-                        assignee_obj = fields.get('assignee')
-                        reporter_obj = fields.get('reporter')
-                        issues.append({
-                            'id': issue.get('id'),
-                            'jira_key': issue.get('key'),
-                            'jira_id': issue.get('id'),
-                            'summary': fields.get('summary', ''),
-                            'description': fields.get('description', ''),
-                            'project_key': issue.get('key', '').split('-')[0] if issue.get('key') else '',
-                            'project_name': '',
-                            'status': (fields.get('status') or {}).get('name', ''),
-                            'issue_type': (fields.get('issuetype') or {}).get('name', ''),
-                            'priority': (fields.get('priority') or {}).get('name', ''),
-                            'assignee_name': (assignee_obj or {}).get('displayName', '') if assignee_obj else '',
-                            'assignee_id': (assignee_obj or {}).get('accountId', '') if assignee_obj else '',
-                            'reporter_name': (reporter_obj or {}).get('displayName', '') if reporter_obj else '',
-                            'reporter_id': (reporter_obj or {}).get('accountId', '') if reporter_obj else '',
-                            'created_date': fields.get('created', ''),
-                            'updated_date': fields.get('updated', ''),
-                            'resolution_date': fields.get('resolutiondate', ''),
-                            'fix_version': ', '.join([v['name'] for v in fields.get('fixVersions', []) if v.get('name')]) or '',
-                            'fix_versions': [v['name'] for v in fields.get('fixVersions', []) if v.get('name')],
-                        })
-                    all_issues.extend(issues)
-                    total = data.get('total', 0)
-                    
-                    if fetch_all:
-                        print(f"[JIRA SERVICE] Página processada. start_at: {start_at}, issues encontradas nesta página: {len(issues)}, total no Jira: {total}")
-                    
-                    if start_at + 100 >= total:
-                        break
-                    start_at += 100
-                
-                # LOG: Debug antes da filtragem manual
-                if fetch_all:
-                    print(f"[JIRA SERVICE] Issues coletadas do Jira antes da filtragem manual: {len(all_issues)}")
+                logger.debug("get_issues fetch_all com filtros %s (JQL: %s)", filters, jql)
+                # Cópia da lista para não alterar o snapshot compartilhado
+                all_issues = list(self._fetch_snapshot(jql, profile))
                 
                 # CORREÇÃO DO BUG: Após buscar as issues do Jira, se houver filtro de fix_version, filtrar manualmente
                 if 'fix_version' in filters:
                     fix_version_value = filters['fix_version'].strip().lower()
-                    print(f"[JIRA SERVICE] Iniciando filtragem manual para fix_version: '{fix_version_value}'")
+                    # Decidido uma vez: sem DEBUG, o laço não faz nenhum trabalho de log
+                    debug = logger.isEnabledFor(logging.DEBUG)
                     
                     filtered_issues = []
                     for issue in all_issues:
@@ -174,15 +621,13 @@ class JiraService:
                         fix_versions = issue.get('fix_versions', [])
                         issue_versions_normalized = [v.strip().lower() for v in fix_versions if v]
                         
-                        if fetch_all and len(filtered_issues) < 5:  # Log apenas para as primeiras 5 issues
-                            print(f"[JIRA SERVICE] Issue {issue.get('jira_key')}: versões = {fix_versions}, normalizado = {issue_versions_normalized}")
-                        
                         if any(fix_version_value == v for v in issue_versions_normalized):
                             filtered_issues.append(issue)
-                            if fetch_all:
-                                print(f"[JIRA SERVICE] ✓ Issue {issue.get('jira_key')} incluída (match: {fix_version_value})")
+                            if debug:
+                                log_sampled(logger, 'fix_version_match', logging.DEBUG,
+                                            "Issue %s incluída (versões %s)", issue.get('jira_key'), fix_versions)
                     
-                    print(f"[JIRA SERVICE] Filtragem manual concluída: {len(filtered_issues)} issues restantes")
+                    logger.debug("Filtragem por fix_version '%s': %d de %d issues", fix_version_value, len(filtered_issues), len(all_issues))
                     all_issues = filtered_issues
                 
                 return {
@@ -195,51 +640,18 @@ class JiraService:
                     'has_prev': False
                 }
             else:
-                start_at = (page - 1) * per_page
-                params = {
-                    'jql': jql,
-                    'startAt': start_at,
-                    'maxResults': per_page,
-                    'fields': 'summary,description,project,status,issuetype,priority,assignee,reporter,created,updated,resolutiondate,fixVersions'
-                }
-                data = self._make_request('search', params)
-                issues = []
-                for issue in data.get('issues', []):
-                    fields = issue.get('fields', {})
-                    assignee_obj = fields.get('assignee')
-                    reporter_obj = fields.get('reporter')
-                    issues.append({
-                        'id': issue.get('id'),
-                        'jira_key': issue.get('key'),
-                        'jira_id': issue.get('id'),
-                        'summary': fields.get('summary', ''),
-                        'description': fields.get('description', ''),
-                        'project_key': issue.get('key', '').split('-')[0] if issue.get('key') else '',
-                        'project_name': '',
-                        'status': (fields.get('status') or {}).get('name', ''),
-                        'issue_type': (fields.get('issuetype') or {}).get('name', ''),
-                        'priority': (fields.get('priority') or {}).get('name', ''),
-                        'assignee_name': (assignee_obj or {}).get('displayName', '') if assignee_obj else '',
-                        'assignee_id': (assignee_obj or {}).get('accountId', '') if assignee_obj else '',
-                        'reporter_name': (reporter_obj or {}).get('displayName', '') if reporter_obj else '',
-                        'reporter_id': (reporter_obj or {}).get('accountId', '') if reporter_obj else '',
-                        'created_date': fields.get('created', ''),
-                        'updated_date': fields.get('updated', ''),
-                        'resolution_date': fields.get('resolutiondate', ''),
-                        'fix_version': ', '.join([v['name'] for v in fields.get('fixVersions', []) if v.get('name')]) or '',
-                        'fix_versions': [v['name'] for v in fields.get('fixVersions', []) if v.get('name')],
-                    })
+                issues, total = self._search_issues_page(jql, page, per_page, profile)
                 return {
                     'issues': issues,
-                    'total': data.get('total', 0),
-                    'pages': (data.get('total', 0) // per_page) + 1,
+                    'total': total,
+                    'pages': (total // per_page) + 1,
                     'current_page': page,
                     'per_page': per_page,
-                    'has_next': (start_at + per_page) < data.get('total', 0),
+                    'has_next': (page - 1) * per_page + per_page < total,
                     'has_prev': page > 1
                 }
         except Exception as e:
-            print(f"Erro ao buscar issues: {e}")
+            logger.error("Erro ao buscar issues: %s", e)
             return {
                 'issues': [],
                 'total': 0,
@@ -250,302 +662,151 @@ class JiraService:
                 'has_prev': False
             }
     
+    def count_issues(self, queries: Dict[str, str]) -> Dict[str, int]:
+        """Conta as issues de cada JQL em paralelo (maxResults=0 ou approximate-count)"""
+        with ThreadPoolExecutor(max_workers=max(1, min(self.fetch_workers, len(queries)))) as executor:
+            futures = {name: submit_in_context(executor, self.pager.count, jql) for name, jql in queries.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def get_issue_counts(self, filters: Dict = None) -> Dict:
+        """Total, criadas e resolvidas nos últimos 30 dias, sem baixar as issues"""
+        base_jql = self._build_jql(filters or {})
+        queries = {'total_issues': base_jql}
+        for name, clause in COUNT_WINDOWS.items():
+            queries[name] = f"{base_jql} AND {clause}" if base_jql else clause
+        return self.count_issues(queries)
+
+    def iter_issues(self, filters: Dict, profile: str = 'table') -> Iterator[Dict]:
+        """Percorre as issues da busca página a página, sem montar a lista completa"""
+        fix_version_value = filters['fix_version'].strip().lower() if 'fix_version' in filters else None
+        for issues in self._iter_issue_pages(self._build_jql(filters), profile):
+            for issue in issues:
+                if fix_version_value is None or any(fix_version_value == v.strip().lower() for v in issue.get('fix_versions', []) if v):
+                    yield issue
+
+    def get_issue(self, issue_key: str) -> Optional[Dict]:
+        """Busca uma issue com todos os campos, inclusive a descrição"""
+        try:
+            issue = self._make_request(f'issue/{issue_key}', {'fields': FIELD_PROFILES['detail']})
+            return self._parse_issue(issue)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+
     def get_dashboard_stats(self, filters: Dict = None) -> Dict:
         """Busca estatísticas para o dashboard"""
         try:
-            filters = filters or {}
-            # Buscar todas as issues do projeto (sem limite)
-            issues_data = self.get_issues(filters, fetch_all=True)
-            issues = issues_data.get('issues', [])
-            total_issues = len(issues)
-            # Contadores
-            recent_issues = 0
-            resolved_issues = 0
-            status_dist = {}
-            type_dist = {}
-            priority_dist = {}
-            assignee_dist = {}
-            reporter_dist = {}
-            version_dist = {}
-            
-            # NOVO: Backlog Aging - contadores por faixa de dias e prioridade
-            backlog_aging = {
-                '0-5 dias': {'Critical': 0, 'High': 0, 'Medium': 0, 'Low': 0, 'Sem prioridade': 0},
-                '6-15 dias': {'Critical': 0, 'High': 0, 'Medium': 0, 'Low': 0, 'Sem prioridade': 0},
-                '16-30 dias': {'Critical': 0, 'High': 0, 'Medium': 0, 'Low': 0, 'Sem prioridade': 0},
-                'Mais de 30 dias': {'Critical': 0, 'High': 0, 'Medium': 0, 'Low': 0, 'Sem prioridade': 0}
-            }
-            
-            thirty_days_ago = datetime.now(datetime.utcnow().astimezone().tzinfo) - timedelta(days=30)
-            today = datetime.now(datetime.utcnow().astimezone().tzinfo)
-            
-            for issue in issues:
-                status = issue.get('status') or 'Desconhecido'
-                status_dist[status] = status_dist.get(status, 0) + 1
-                issue_type = issue.get('issue_type') or 'Desconhecido'
-                type_dist[issue_type] = type_dist.get(issue_type, 0) + 1
-                priority = issue.get('priority') or 'Desconhecido'
-                priority_dist[priority] = priority_dist.get(priority, 0) + 1
-                assignee = issue.get('assignee_name') or 'Não atribuído'
-                assignee_dist[assignee] = assignee_dist.get(assignee, 0) + 1
-                reporter = issue.get('reporter_name') or 'Não atribuído'
-                reporter_dist[reporter] = reporter_dist.get(reporter, 0) + 1
-                
-                # Datas para cálculos
-                created_date = issue.get('created_date')
-                resolution_date = issue.get('resolution_date')
-                updated_date = issue.get('updated_date')
-                created_dt = self.parse_jira_date(created_date) if isinstance(created_date, str) else created_date
-                resolution_dt = self.parse_jira_date(resolution_date) if isinstance(resolution_date, str) else resolution_date
-                updated_dt = self.parse_jira_date(updated_date) if isinstance(updated_date, str) else updated_date
-                
-                # Contar criadas nos últimos 30 dias
-                if created_dt and created_dt >= thirty_days_ago:
-                    recent_issues += 1
-                
-                # Considera resolvida se:
-                # 1. Tem resolution_date recente
-                # 2. OU status é 'Concluído' (ou equivalente) e updated_date recente
-                status_resolvidos = ['done', 'concluído', 'concluído.', 'cancelado', 'itens concluídos', 'resolved', 'fechado', 'closed']
-                if (resolution_dt and resolution_dt >= thirty_days_ago) or \
-                   (status and status.strip().lower() in status_resolvidos and updated_dt and updated_dt >= thirty_days_ago):
-                    resolved_issues += 1
-                
-                # NOVO: Calcular Backlog Aging apenas para issues abertas (sem resolution_date)
-                if not resolution_dt and created_dt:
-                    days_open = (today - created_dt).days
-                    
-                    # LOG: Debug de prioridades para entender os valores reais
-                    if sum(sum(priorities.values()) for priorities in backlog_aging.values()) < 10:
-                        print(f"[BACKLOG AGING] Issue {issue.get('jira_key')}: prioridade original='{priority}', criada em {created_date}, {days_open} dias aberta")
-                    
-                    # Normalizar prioridade - incluir mais variações do Jira
-                    priority_normalized = priority.lower() if priority else ''
-                    if priority_normalized in ['critical', 'highest', 'blocker']:
-                        issue_priority = 'Critical'
-                    elif priority_normalized in ['high', 'major']:
-                        issue_priority = 'High'
-                    elif priority_normalized in ['medium', 'normal']:
-                        issue_priority = 'Medium'
-                    elif priority_normalized in ['low', 'minor', 'lowest']:
-                        issue_priority = 'Low'
-                    else:
-                        issue_priority = 'Sem prioridade'
-                    
-                    # LOG: Debug das primeiras 5 issues abertas
-                    if sum(sum(priorities.values()) for priorities in backlog_aging.values()) < 5:
-                        print(f"[BACKLOG AGING] Issue {issue.get('jira_key')}: {days_open} dias aberta, prioridade normalizada: {issue_priority}")
-                    
-                    # Classificar por faixa de dias
-                    if days_open <= 5:
-                        backlog_aging['0-5 dias'][issue_priority] += 1
-                    elif days_open <= 15:
-                        backlog_aging['6-15 dias'][issue_priority] += 1
-                    elif days_open <= 30:
-                        backlog_aging['16-30 dias'][issue_priority] += 1
-                    else:
-                        backlog_aging['Mais de 30 dias'][issue_priority] += 1
-                
-                # Versões/Release
-                fix_versions = issue.get('fix_versions')
-                # Pode ser lista, string JSON ou string simples
-                if isinstance(fix_versions, str):
-                    try:
-                        fix_versions = json.loads(fix_versions)
-                    except Exception:
-                        fix_versions = [fix_versions]
-                if not fix_versions or fix_versions in ([], [None], [""]):
-                    version_dist['Não atribuído'] = version_dist.get('Não atribuído', 0) + 1
-                else:
-                    for v in fix_versions:
-                        if not v:
-                            version_dist['Não atribuído'] = version_dist.get('Não atribuído', 0) + 1
-                        else:
-                            version_dist[v] = version_dist.get(v, 0) + 1
-            
-            # Converter backlog_aging para formato adequado para o frontend
-            backlog_aging_formatted = []
-            for time_range, priorities in backlog_aging.items():
-                total_range = sum(priorities.values())
-                # CORREÇÃO: Incluir todas as faixas, mesmo com zero, para o gráfico renderizar
-                backlog_aging_formatted.append({
-                    'time_range': time_range,
-                    'total': total_range,
-                    'critical': priorities['Critical'],
-                    'high': priorities['High'],
-                    'medium': priorities['Medium'],
-                    'low': priorities['Low'],
-                    'no_priority': priorities['Sem prioridade']
-                })
-            
-            # LOG: Debug do resultado final
-            total_open_issues = sum(sum(priorities.values()) for priorities in backlog_aging.values())
-            print(f"[BACKLOG AGING] Total de issues abertas encontradas: {total_open_issues}")
-            print(f"[BACKLOG AGING] Total de issues processadas: {total_issues}")
-            print(f"[BACKLOG AGING] Issues resolvidas: {resolved_issues}")
-            print(f"[BACKLOG AGING] Faixas com dados: {len(backlog_aging_formatted)}")
-            for item in backlog_aging_formatted:
-                if item['total'] > 0:
-                    print(f"[BACKLOG AGING] {item['time_range']}: {item['total']} tickets (C:{item['critical']}, H:{item['high']}, M:{item['medium']}, L:{item['low']}, S:{item['no_priority']})")
-            
-            # Montar resposta
-            return {
-                'total_issues': total_issues,
-                'recent_issues': recent_issues,
-                'resolved_issues': resolved_issues,
-                'status_distribution': [
-                    {'status': k, 'count': v} for k, v in status_dist.items()
-                ],
-                'type_distribution': [
-                    {'type': k, 'count': v} for k, v in type_dist.items()
-                ],
-                'priority_distribution': [
-                    {'priority': k, 'count': v} for k, v in priority_dist.items()
-                ],
-                'assignee_distribution': [
-                    {'assignee': k, 'count': v} for k, v in assignee_dist.items()
-                ],
-                'reporter_distribution': [
-                    {'reporter': k, 'count': v} for k, v in reporter_dist.items()
-                ],
-                'version_distribution': [
-                    {'version': k, 'count': v} for k, v in version_dist.items()
-                ],
-                'backlog_aging': backlog_aging_formatted  # NOVO: Dados de Backlog Aging
-            }
+            # Todas as issues do projeto (sem limite), em colunas
+            return self._aggregate_columns(filters or {}).stats()
         except Exception as e:
-            print(f"Erro ao buscar estatísticas: {e}")
+            logger.error("Erro ao buscar estatísticas: %s", e)
             return None
     
     def get_timeline_data(self, filters: Dict = None, days: int = 30) -> Dict:
         """Busca dados de timeline usando as issues já coletadas"""
         try:
-            filters = filters or {}
-            
-            # Buscar todas as issues com os filtros aplicados
-            issues_data = self.get_issues(filters, fetch_all=True)
-            issues = issues_data.get('issues', [])
-            
-            print(f"[TIMELINE] Processando {len(issues)} issues para timeline de {days} dias")
-            
-            created_timeline = []
-            resolved_timeline = []
-            
-            # Preparar contadores por data
-            created_counts = {}
-            resolved_counts = {}
-            
-            # Processar cada issue
-            for issue in issues:
-                # Processar data de criação
-                created_date = issue.get('created_date')
-                if created_date:
-                    created_dt = self.parse_jira_date(created_date) if isinstance(created_date, str) else created_date
-                    if created_dt:
-                        date_str = created_dt.date().strftime('%Y-%m-%d')
-                        created_counts[date_str] = created_counts.get(date_str, 0) + 1
-                
-                # Processar data de resolução
-                resolution_date = issue.get('resolution_date')
-                if resolution_date:
-                    resolution_dt = self.parse_jira_date(resolution_date) if isinstance(resolution_date, str) else resolution_date
-                    if resolution_dt:
-                        date_str = resolution_dt.date().strftime('%Y-%m-%d')
-                        resolved_counts[date_str] = resolved_counts.get(date_str, 0) + 1
-            
-            # Gerar timeline para os últimos N dias
-            for i in range(days):
-                date = (datetime.now() - timedelta(days=days-i-1)).date()
-                date_str = date.strftime('%Y-%m-%d')
-                
-                created_count = created_counts.get(date_str, 0)
-                resolved_count = resolved_counts.get(date_str, 0)
-                
-                created_timeline.append({'date': date_str, 'count': created_count})
-                resolved_timeline.append({'date': date_str, 'count': resolved_count})
-            
-            # Log para debug
-            total_created = sum(item['count'] for item in created_timeline)
-            total_resolved = sum(item['count'] for item in resolved_timeline)
-            print(f"[TIMELINE] Total criadas: {total_created}, Total resolvidas: {total_resolved}")
-            
-            # Mostrar alguns exemplos de datas com dados
-            created_with_data = [item for item in created_timeline if item['count'] > 0]
-            resolved_with_data = [item for item in resolved_timeline if item['count'] > 0]
-            
-            if created_with_data:
-                print(f"[TIMELINE] Exemplos de datas com issues criadas: {created_with_data[:3]}")
-            if resolved_with_data:
-                print(f"[TIMELINE] Exemplos de datas com issues resolvidas: {resolved_with_data[:3]}")
-            
-            return {
-                'created_timeline': created_timeline,
-                'resolved_timeline': resolved_timeline
-            }
+            return self._aggregate_columns(filters or {}).timeline(days)
         except Exception as e:
-            print(f"Erro ao buscar timeline: {e}")
+            logger.error("Erro ao buscar timeline: %s", e)
             return None
+
+    def get_dashboard_bundle(self, filters: Dict = None, days: int = 30, page: int = 1, per_page: int = 50) -> Dict:
+        """Estatísticas, timeline, opções de filtro, total do projeto e primeira página de issues.
+
+        Estatísticas e timeline saem das colunas de agregação (sem manter os
+        dicionários das issues); só a página pedida é buscada com os campos da
+        tabela. As opções de filtro vêm dos metadados do projeto
+        (get_filter_options). Assim como nos endpoints separados, estatísticas
+        e timeline ignoram o filtro de fix_version, que só restringe a página.
+        """
+        filters = filters or {}
+        scan_filters = {k: v for k, v in filters.items() if k != 'fix_version'}
+        columns = self._fetch_columns(self._build_jql(scan_filters))
+        issues, total = self._search_issues_page(self._build_jql(filters), page, per_page)
+
+        # Total do projeto: as próprias colunas quando não há outros filtros, senão só a contagem
+        project_filters = {'project': filters['project']} if 'project' in filters else {}
+        if project_filters == scan_filters:
+            project_total = columns.size
+        else:
+            project_total = self.count_issues({'total': self._build_jql(project_filters)})['total']
+
+        return {
+            'stats': columns.stats(),
+            'timeline': columns.timeline(days),
+            'filter_options': self.get_filter_options(filters.get('project')),
+            'project_total_issues': project_total,
+            'issues': {
+                'issues': issues,
+                'total': total,
+                'pages': max(1, -(-total // per_page)),
+                'current_page': page,
+                'per_page': per_page,
+                'has_next': (page - 1) * per_page + per_page < total,
+                'has_prev': page > 1
+            }
+        }
     
+    def _fetch_users(self, endpoint: str, params: Dict) -> List[Dict]:
+        """Todas as páginas de um endpoint de usuários, como {'id', 'name'}"""
+        users = {}
+        start_at = 0
+        while True:
+            # O Jira filtra cada janela startAt/maxResults depois de recortá-la:
+            # página curta não indica o fim, só a vazia
+            page = self._make_request(endpoint, {**params, 'startAt': start_at, 'maxResults': USERS_PAGE_SIZE})
+            if not page:
+                return sorted(users.values(), key=lambda u: (u['name'] or '').lower())
+            for u in page:
+                if u.get('accountId') and u.get('active', True):
+                    users[u['accountId']] = {'id': u['accountId'], 'name': u.get('displayName')}
+            start_at += USERS_PAGE_SIZE
+
+    def _project_filter_options(self, project_key: str) -> Dict:
+        """Opções de filtro completas a partir dos metadados do projeto, sem baixar issues"""
+        requests_by_facet = {
+            'statuses': lambda: self._make_request(f'project/{project_key}/statuses'),
+            'priorities': lambda: self._make_request('priority'),
+            'versions': lambda: self._make_request(f'project/{project_key}/versions'),
+            'assignees': lambda: self._fetch_users('user/assignable/search', {'project': project_key}),
+            'reporters': lambda: self._fetch_users('user/permission/search', {
+                'projectKey': project_key, 'permissions': 'CREATE_ISSUES'
+            }),
+        }
+        with ThreadPoolExecutor(max_workers=len(requests_by_facet)) as executor:
+            futures = {facet: submit_in_context(executor, load) for facet, load in requests_by_facet.items()}
+            data = {facet: future.result() for facet, future in futures.items()}
+
+        # project/{key}/statuses traz os status agrupados por tipo de issue
+        return {
+            'statuses': sorted({s['name'] for t in data['statuses'] for s in t.get('statuses', []) if s.get('name')}),
+            'types': sorted({t['name'] for t in data['statuses'] if t.get('name')}),
+            'priorities': sorted({p['name'] for p in data['priorities'] if p.get('name')}),
+            'assignees': data['assignees'],
+            'reporters': data['reporters'],
+            'versions': sorted({v['name'] for v in data['versions'] if v.get('name')})
+        }
+
+    def metadata_options(self, project_key: str) -> Optional[Dict]:
+        """Opções de filtro dos metadados do projeto, em cache; None se indisponíveis"""
+        try:
+            return self.metadata.get_or_load(project_key, lambda: self._project_filter_options(project_key))
+        except Exception as e:
+            logger.warning("Metadados de %s indisponíveis, usando as issues do projeto: %s", project_key, e)
+            return None
+
     def get_filter_options(self, project_key: str = None) -> Dict:
         """Busca opções para filtros"""
         try:
-            # Busca metadados do projeto
+            # Valores das issues entram sempre: pessoas inativas ou sem permissão seguem nelas
             jql = f"project = {project_key}" if project_key else ""
-            params = {
-                'jql': jql,
-                'maxResults': 1000,
-                'fields': 'status,issuetype,priority,assignee,reporter,fixVersions'
-            }
-            
-            data = self._make_request('search', params)
-            
-            statuses = set()
-            types = set()
-            priorities = set()
-            assignees = {}
-            reporters = {}
-            versions = set()
-            
-            for issue in data.get('issues', []):
-                fields = issue.get('fields', {})
-                
-                # Status
-                if fields.get('status'):
-                    statuses.add(fields['status'].get('name', ''))
-                
-                # Tipo
-                if fields.get('issuetype'):
-                    types.add(fields['issuetype'].get('name', ''))
-                
-                # Prioridade
-                if fields.get('priority'):
-                    priorities.add(fields['priority'].get('name', ''))
-                
-                # Responsável
-                if fields.get('assignee'):
-                    assignee = fields['assignee']
-                    assignees[assignee.get('accountId', assignee.get('displayName', ''))] = assignee.get('displayName', '')
-                
-                # Reporter
-                if fields.get('reporter'):
-                    reporter = fields['reporter']
-                    reporters[reporter.get('accountId', reporter.get('displayName', ''))] = reporter.get('displayName', '')
-                
-                # Versões
-                for version in fields.get('fixVersions', []):
-                    versions.add(version.get('name', ''))
-            
-            return {
-                'statuses': sorted(list(statuses)),
-                'types': sorted(list(types)),
-                'priorities': sorted(list(priorities)),
-                'assignees': [{'id': k, 'name': v} for k, v in assignees.items()],
-                'reporters': [{'id': k, 'name': v} for k, v in reporters.items()],
-                'versions': sorted(list(versions))
-            }
+            from_issues = self._fetch_columns(jql).filter_options()
+            metadata = self.metadata_options(project_key) if project_key else None
+            return merge_filter_options(metadata, from_issues) if metadata else from_issues
             
         except Exception as e:
-            print(f"Erro ao buscar opções de filtro: {e}")
+            logger.error("Erro ao buscar opções de filtro: %s", e)
             return {
                 'statuses': [],
                 'types': [],
@@ -555,69 +816,352 @@ class JiraService:
                 'versions': []
             }
 
-    def parse_jira_date(self, date_str):
+    def sync_projects_to_db(self) -> List[str]:
+        """Sincroniza a lista de projetos do Jira para o banco"""
+        projects = self.get_projects()
+        for project_data in projects:
+            project = JiraProject.query.filter_by(key=project_data['key']).first()
+            if not project:
+                project = JiraProject(jira_id=project_data['jira_id'], key=project_data['key'])
+                db.session.add(project)
+            project.name = project_data.get('name') or project_data['key']
+            project.description = project_data.get('description', '')
+            project.project_type = project_data.get('project_type', '')
+            project.lead_email = project_data.get('lead_email', '')
+            project.lead_name = project_data.get('lead_name', '')
+            project.last_sync = datetime.utcnow()
+        db.session.commit()
+        return [p['key'] for p in projects]
+
+    def sync_versions_to_db(self, project_key: str) -> int:
+        """Sincroniza as versões (releases) de um projeto para o banco"""
+        data = self._make_request(f'project/{project_key}/versions')
+        for version_data in data:
+            self.store_version(project_key, version_data)
+        db.session.commit()
+        self.metadata.invalidate(lambda key: key == project_key)
+        return len(data)
+
+    def store_version(self, project_key: str, version_data: Dict) -> None:
+        """Insere ou atualiza uma versão vinda da API ou de um webhook (sem commit)"""
+        version = JiraVersion.query.filter_by(jira_id=str(version_data.get('id'))).first()
+        if not version:
+            version = JiraVersion(jira_id=str(version_data.get('id')))
+            db.session.add(version)
+        version.name = version_data.get('name', '')
+        version.description = version_data.get('description', '')
+        version.project_key = project_key
+        version.released = version_data.get('released', False)
+        version.archived = version_data.get('archived', False)
+        version.release_date = self._parse_jira_day(version_data.get('releaseDate'))
+        version.start_date = self._parse_jira_day(version_data.get('startDate'))
+        version.last_sync = datetime.utcnow()
+
+    def _parse_jira_day(self, date_str):
         if not date_str:
             return None
         try:
-            return datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%S.%f%z")
-        except Exception:
-            try:
-                return datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%S%z")
-            except Exception:
-                return None
+            return datetime.strptime(date_str, '%Y-%m-%d').date()
+        except ValueError:
+            return None
 
-    def sync_issues_to_db(self, project_key: str):
-        """Sincroniza issues do Jira para o banco, salvando fix_versions corretamente"""
-        filters = {'project': project_key}
-        page = 1
-        per_page = 100
-        issues_data = self.get_issues(filters, page, per_page, fetch_all=True)
-        issues = issues_data.get('issues', [])
-        for issue_data in issues:
-            jira_key = issue_data.get('jira_key')
-            # Busca issue existente ou cria nova
-            issue = JiraIssue.query.filter_by(jira_key=jira_key).first()
-            if not issue:
-                issue = JiraIssue(jira_key=jira_key, jira_id=issue_data.get('jira_id'))
-                db.session.add(issue)
-            # Atualiza campos
-            issue.summary = issue_data.get('summary', '')
-            issue.description = issue_data.get('description', '')
-            issue.project_key = issue_data.get('project_key', '')
-            issue.project_name = issue_data.get('project_name', '')
-            issue.status = issue_data.get('status', '')
-            issue.issue_type = issue_data.get('issue_type', '')
-            issue.priority = issue_data.get('priority', '')
-            issue.assignee_email = ''
-            issue.assignee_name = issue_data.get('assignee_name', '')
-            issue.reporter_email = ''
-            issue.reporter_name = issue_data.get('reporter_name', '')
-            issue.creator_email = ''
-            issue.creator_name = ''
-            # Salva fix_versions como array JSON
-            fix_versions = issue_data.get('fix_versions') or issue_data.get('fix_version') or []
-            if isinstance(fix_versions, str):
-                fix_versions = [v.strip() for v in fix_versions.split(',') if v.strip()]
-            elif not isinstance(fix_versions, list):
-                fix_versions = []
-            issue.fix_versions = json.dumps(fix_versions)
-            # Datas
-            try:
-                issue.created_date = self.parse_jira_date(issue_data.get('created_date'))
-            except Exception:
-                issue.created_date = None
-            try:
-                issue.updated_date = self.parse_jira_date(issue_data.get('updated_date'))
-            except Exception:
-                issue.updated_date = None
-            try:
-                issue.resolved_date = self.parse_jira_date(issue_data.get('resolution_date'))
-            except Exception:
-                issue.resolved_date = None
+    def _local_naive(self, dt):
+        """Remove o fuso mantendo o horário local informado pelo Jira (como o SQLite armazena)"""
+        return dt.replace(tzinfo=None) if dt else None
+
+    def sync_issues_to_db(self, project_key: str, full: bool = False) -> Dict:
+        """Sincroniza issues do Jira para o banco.
+
+        Após a primeira carga, busca apenas as issues com `updated` a partir da
+        marca d'água do projeto (menos uma janela de sobreposição). Com
+        `full=True` refaz a carga completa e remove issues que saíram do projeto.
+        """
+        state = JiraSyncState.query.filter_by(project_key=project_key).first()
+        if not state:
+            state = JiraSyncState(project_key=project_key)
+            db.session.add(state)
+
+        jql = f"project = {project_key}"
+        delta = not full and state.updated_watermark is not None
+        if delta:
+            since = state.updated_watermark - timedelta(minutes=SYNC_OVERLAP_MINUTES)
+            # JQL interpreta a data no fuso do usuário, o mesmo em que o Jira devolve 'updated'
+            jql += f" AND updated >= \"{since.strftime('%Y/%m/%d %H:%M')}\""
+        logger.info("Projeto %s: sincronização %s (%s)", project_key, 'delta' if delta else 'completa', jql)
+
+        # Busca direto no Jira (sem o cache de snapshots) e grava em lotes conforme as páginas chegam
+        watermark = state.updated_watermark
+        latest_updated = None
+        synced_keys = set()
+        fetched = 0
+        changed = 0
+        chunk = []
+        for issues in self._iter_issue_pages(jql):
+            fetched += len(issues)
+            # Datas convertidas uma vez por issue, na linha usada pelo upsert e pela marca d'água
+            rows = [self._issue_row(issue_data) for issue_data in issues]
+            chunk.extend(rows)
+            if len(chunk) >= UPSERT_CHUNK_SIZE:
+                changed += self._upsert_rows(chunk, only_newer=delta)
+                chunk = []
+            for issue_data, row in zip(issues, rows):
+                synced_keys.add(row['jira_key'])
+                updated_dt = row['updated_date']
+                if updated_dt and (watermark is None or updated_dt > watermark):
+                    watermark = updated_dt
+                    latest_updated = issue_data.get('updated_date')
+        if chunk:
+            changed += self._upsert_rows(chunk, only_newer=delta)
+
+        removed = 0
+        if not delta:
+            local_keys = [k for (k,) in db.session.query(JiraIssue.jira_key).filter(JiraIssue.project_key == project_key)]
+            stale_keys = [k for k in local_keys if k not in synced_keys]
+            for i in range(0, len(stale_keys), UPSERT_CHUNK_SIZE):
+                self._delete_issues(project_key, stale_keys[i:i + UPSERT_CHUNK_SIZE])
+            removed = len(stale_keys)
+            state.last_full_sync = datetime.utcnow()
+
+        state.updated_watermark = watermark
+        if latest_updated:
+            # As datas são gravadas no horário local do Jira; o fuso permite comparar com o agora
+            offset = parse_jira_date(latest_updated).utcoffset()
+            state.utc_offset_minutes = int(offset.total_seconds() // 60)
+        state.last_sync = datetime.utcnow()
+        state.last_sync_mode = 'delta' if delta else 'full'
+        state.last_sync_count = changed
+        db.session.commit()
+        logger.info(
+            "Projeto %s: %d issues recebidas, %d gravadas, %d removidas", project_key, fetched, changed, removed,
+            extra={'fields': {'project': project_key, 'mode': state.last_sync_mode}}
+        )
+        return {
+            'project_key': project_key,
+            'mode': state.last_sync_mode,
+            'issues_fetched': fetched,
+            'issues_synced': changed,
+            'issues_removed': removed,
+            'updated_watermark': watermark.isoformat() if watermark else None
+        }
+
+    def _delete_issues(self, project_key: str, keys: List[str]) -> int:
+        """Remove issues do projeto, suas versões e sua contribuição na timeline (sem commit)"""
+        dates = db.session.query(JiraIssue.created_date, JiraIssue.resolved_date).filter(JiraIssue.jira_key.in_(keys))
+        days = {d.date() for pair in dates for d in pair if d}
+        JiraIssueVersion.query.filter(JiraIssueVersion.issue_key.in_(keys)).delete(synchronize_session=False)
+        removed = JiraIssue.query.filter(JiraIssue.jira_key.in_(keys)).delete(synchronize_session=False)
+        JiraDailyRollup.refresh(db.session, project_key, days)
+        return removed
+
+    def ingest_issues(self, raw_issues: List[Dict]) -> int:
+        """Grava no banco issues no formato da API (webhooks, releituras após edição)"""
+        return self._upsert_issues([self._parse_issue(issue) for issue in raw_issues])
+
+    def remove_issues(self, keys: List[str]) -> int:
+        """Remove do banco issues apagadas no Jira"""
+        removed = 0
+        by_project = {}
+        for key in keys:
+            by_project.setdefault(key.split('-')[0], []).append(key)
+        for project_key, project_keys in by_project.items():
+            removed += self._delete_issues(project_key, project_keys)
+        db.session.commit()
+        return removed
+
+    def _write_through(self, issue_key: str) -> Optional[Dict]:
+        """Relê a issue após uma edição e a aplica no banco local e nos snapshots.
+
+        Estatísticas e timeline são derivadas do banco (SQL/rollups) ou dos
+        snapshots, então passam a refletir a edição sem nova varredura. A
+        edição já está no Jira: se a releitura ou a gravação local falhar (ex.:
+        banco travado por um sync), os snapshots do projeto são descartados e
+        o próximo sync delta traz a issue.
+        """
+        project_key = issue_key.split('-')[0]
+        try:
+            issue = self._parse_issue(self._make_request(f'issue/{issue_key}', {'fields': FIELD_PROFILES['detail']}))
+            if JiraSyncState.query.filter_by(project_key=project_key).first():
+                self._upsert_issues([issue])
+            self._patch_snapshots([issue])
+            return issue
+        except Exception as e:
+            db.session.rollback()
+            logger.warning("Não foi possível aplicar %s localmente após a edição, descartando snapshots: %s", issue_key, e)
+            self.invalidate_project(project_key)
+            return None
+
+    def _patch_snapshots(self, issues: List[Dict]) -> None:
+        """Troca as issues nos snapshots dos projetos inteiros.
+
+        Snapshots filtrados podem deixar de conter (ou passar a conter) as issues
+        após a edição, então são descartados.
+        """
+        by_project = {}
+        for issue in issues:
+            by_project.setdefault(f"project = {issue['project_key']}", {})[issue['jira_key']] = issue
+
+        stale = set()
+        # Inclui varreduras em andamento, que começaram antes da edição
+        for key in self.snapshots.keys(loading=True):
+            jql = key[1]
+            if jql in by_project:
+                edited = by_project[jql]
+                self.snapshots.update(key, lambda cached: cached.replaced(edited))
+            elif any(clause in jql for clause in by_project) or 'project =' not in jql:
+                stale.add(key)
+        if stale:
+            self.snapshots.invalidate(lambda key: key in stale)
+
+    def _refresh_edited(self, keys: List[str]) -> Dict[str, Dict]:
+        """Relê de uma vez as issues editadas em lote e as aplica no banco e nos snapshots"""
+        if not keys:
+            return {}
+        projects = {key.split('-')[0] for key in keys}
+        try:
+            issues = []
+            for start in range(0, len(keys), PAGE_SIZE):
+                jql = f"key in ({', '.join(keys[start:start + PAGE_SIZE])})"
+                for page in self._iter_issue_pages(jql, 'detail'):
+                    issues.extend(page)
+            synced = {state.project_key for state in JiraSyncState.query.filter(JiraSyncState.project_key.in_(projects))}
+            self._upsert_issues([issue for issue in issues if issue['project_key'] in synced])
+            self._patch_snapshots(issues)
+        except Exception as e:
+            # As edições já estão no Jira; o próximo sync delta corrige o banco local
+            db.session.rollback()
+            logger.warning("Não foi possível aplicar o lote editado localmente, descartando snapshots: %s", e)
+            for project_key in projects:
+                self.invalidate_project(project_key)
+            return {}
+        return {issue['jira_key']: issue for issue in issues}
+
+    def invalidate_project(self, project_key: str) -> int:
+        """Descarta os snapshots em memória que podem conter issues do projeto"""
+        clause = f"project = {project_key}"
+        return self.snapshots.invalidate(lambda key: clause in key[1] or 'project =' not in key[1])
+
+    def _issue_row(self, issue_data: Dict) -> Dict:
+        """Converte a issue do dashboard para as colunas de jira_issues"""
+        # Salva fix_versions como array JSON
+        fix_versions = issue_data.get('fix_versions') or issue_data.get('fix_version') or []
+        if isinstance(fix_versions, str):
+            fix_versions = [v.strip() for v in fix_versions.split(',') if v.strip()]
+        elif not isinstance(fix_versions, list):
+            fix_versions = []
+        description = issue_data.get('description', '')
+        return {
+            'jira_key': issue_data.get('jira_key'),
+            'jira_id': issue_data.get('jira_id') or '',
+            'summary': issue_data.get('summary') or '',
+            # Descrição vem em ADF (Atlassian Document Format); salva como JSON
+            'description': json.dumps(description) if isinstance(description, (dict, list)) else description,
+            'project_key': issue_data.get('project_key', ''),
+            'project_name': issue_data.get('project_name') or '',
+            'status': issue_data.get('status') or '',
+            'issue_type': issue_data.get('issue_type') or '',
+            'priority': issue_data.get('priority', ''),
+            'assignee_email': '',
+            'assignee_name': issue_data.get('assignee_name', ''),
+            'assignee_id': issue_data.get('assignee_id', ''),
+            'reporter_email': '',
+            'reporter_name': issue_data.get('reporter_name', ''),
+            'reporter_id': issue_data.get('reporter_id', ''),
+            'creator_email': '',
+            'creator_name': '',
+            'fix_versions': json.dumps(fix_versions),
+            'affected_versions': json.dumps(issue_data.get('affected_versions') or []),
+            'created_date': self._local_naive(parse_jira_date(issue_data.get('created_date'))),
+            'updated_date': self._local_naive(parse_jira_date(issue_data.get('updated_date'))),
+            'resolved_date': self._local_naive(parse_jira_date(issue_data.get('resolution_date'))),
+            'last_sync': datetime.utcnow(),
+        }
+
+    def _upsert_issues(self, issues: List[Dict]) -> int:
+        """Grava um lote de issues no formato do dashboard"""
+        return self._upsert_rows([self._issue_row(issue_data) for issue_data in issues])
+
+    def _upsert_rows(self, issue_rows: List[Dict], only_newer: bool = True) -> int:
+        """Grava um lote de linhas com um único INSERT ... ON CONFLICT(jira_key) DO UPDATE.
+
+        Só grava issues com `updated` mais recente que o do banco, de modo que
+        eventos fora de ordem (webhooks) não sobrescrevem dados novos. Com
+        only_newer=False (sync completo) regrava também as de mesmo `updated`,
+        preenchendo colunas acrescentadas depois da gravação. O lote é
+        commitado ao final para manter a memória estável em projetos grandes.
+        """
+        rows = {row['jira_key']: row for row in issue_rows if row['jira_key']}
+        if not rows:
+            return 0
+
+        existing = {
+            key: (updated, created, resolved)
+            for key, updated, created, resolved in db.session.query(
+                JiraIssue.jira_key, JiraIssue.updated_date, JiraIssue.created_date, JiraIssue.resolved_date
+            ).filter(JiraIssue.jira_key.in_(list(rows)))
+        }
+        changed = [
+            row for key, row in rows.items()
+            if key not in existing or row['updated_date'] is None or existing[key][0] is None
+            or row['updated_date'] > existing[key][0]
+            or (not only_newer and row['updated_date'] == existing[key][0])
+        ]
+        if not changed:
+            return 0
+
+        # Dias da timeline afetados: datas atuais e anteriores de criação/resolução
+        rollup_days = {}
+        for row in changed:
+            dates = [row['created_date'], row['resolved_date']]
+            if row['jira_key'] in existing:
+                dates.extend(existing[row['jira_key']][1:])
+            rollup_days.setdefault(row['project_key'], set()).update(d.date() for d in dates if d)
+
+        table = JiraIssue.__table__
+        insert = pg_insert if db.engine.dialect.name == 'postgresql' else sqlite_insert
+        stmt = insert(table).values(changed)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.jira_key],
+            set_={column: stmt.excluded[column] for column in changed[0] if column != 'jira_key'},
+            where=or_(
+                table.c.updated_date.is_(None),
+                stmt.excluded.updated_date.is_(None),
+                stmt.excluded.updated_date > table.c.updated_date
+                if only_newer else stmt.excluded.updated_date >= table.c.updated_date
+            )
+        )
+        db.session.execute(stmt)
+        self._replace_issue_versions(changed)
+        for project_key, days in rollup_days.items():
+            JiraDailyRollup.refresh(db.session, project_key, days)
         db.session.commit()
+        return len(changed)
+
+    def _replace_issue_versions(self, rows: List[Dict]) -> None:
+        """Regrava as associações de versão das issues do lote"""
+        keys = [row['jira_key'] for row in rows]
+        JiraIssueVersion.query.filter(JiraIssueVersion.issue_key.in_(keys)).delete(synchronize_session=False)
+        version_rows = [
+            v for row in rows
+            for v in JiraIssueVersion.rows_for(row['jira_key'], row['project_key'], row.get('fix_versions'), row.get('affected_versions'))
+        ]
+        if version_rows:
+            db.session.execute(JiraIssueVersion.__table__.insert(), version_rows)
 
-    def update_issue(self, issue_key: str, update_fields: Dict) -> Dict:
-        """Atualiza uma issue no Jira"""
+    def full_sync(self, full: bool = False) -> List[Dict]:
+        """Sincroniza projetos, versões e issues de todos os projetos"""
+        results = []
+        for project_key in self.sync_projects_to_db():
+            try:
+                self.sync_versions_to_db(project_key)
+                results.append(self.sync_issues_to_db(project_key, full=full))
+            except Exception as e:
+                db.session.rollback()
+                logger.exception("Erro ao sincronizar projeto %s", project_key)
+                results.append({'project_key': project_key, 'error': str(e)})
+        return results
+
+    def update_issue(self, issue_key: str, update_fields: Dict, write_through: bool = True) -> Dict:
+        """Atualiza uma issue no Jira; write_through=False deixa a releitura para quem chamou"""
         try:
             # Preparar payload para atualização
             fields = {}
@@ -628,7 +1172,7 @@ class JiraService:
             
             if 'status' in update_fields:
                 # Para status, precisamos fazer uma transição
-                return self._update_issue_status(issue_key, update_fields['status'])
+                return self._update_issue_status(issue_key, update_fields['status'], write_through)
             
             if 'priority' in update_fields:
                 # Buscar ID da prioridade
@@ -664,12 +1208,13 @@ class JiraService:
                 payload = {'fields': fields}
                 response = self._make_request_put(f'issue/{issue_key}', payload)
                 
-                print(f"[UPDATE ISSUE] Issue {issue_key} atualizada com sucesso: {fields}")
+                logger.info("Issue %s atualizada: %s", issue_key, ', '.join(fields))
                 
                 return {
                     'success': True,
                     'message': f'Issue {issue_key} atualizada com sucesso',
-                    'updated_fields': list(fields.keys())
+                    'updated_fields': list(fields.keys()),
+                    'issue': self._write_through(issue_key) if write_through else None
                 }
             else:
                 return {
@@ -678,49 +1223,135 @@ class JiraService:
                 }
                 
         except Exception as e:
-            print(f"Erro ao atualizar issue {issue_key}: {e}")
+            logger.error("Erro ao atualizar issue %s: %s", issue_key, e)
             return {
                 'success': False,
                 'message': f'Erro ao atualizar issue: {str(e)}'
             }
     
-    def _update_issue_status(self, issue_key: str, new_status: str) -> Dict:
+    def bulk_update(self, updates: List[Dict], max_workers: int = BULK_WORKERS) -> Dict:
+        """Aplica várias edições ({'key', 'fields'}) em paralelo.
+
+        O pool limita as chamadas simultâneas ao Jira e o transporte pausa todas
+        elas quando o Jira responde 429. As issues alteradas são relidas numa
+        única busca no final, com uma só gravação no banco e nos snapshots.
+        """
+        from flask import current_app
+        app = current_app._get_current_object()
+
+        def apply(update: Dict) -> Dict:
+            key = update.get('key') or ''
+            if not isinstance(key, str) or not ISSUE_KEY_RE.match(key):
+                return {'success': False, 'message': f'Chave de issue inválida: {key!r}'}
+            fields = update.get('fields') or {}
+            if not isinstance(fields, dict):
+                return {'success': False, 'message': f'Campos inválidos para {key}: esperado um objeto'}
+            with app.app_context():
+                try:
+                    return self.update_issue(key, fields, write_through=False)
+                finally:
+                    db.session.remove()
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(updates)))) as executor:
+            outcomes = [future.result() for future in [submit_in_context(executor, apply, u) for u in updates]]
+
+        changed = list(dict.fromkeys(u['key'] for u, o in zip(updates, outcomes) if o.get('success')))
+        refreshed = self._refresh_edited(changed)
+
+        results = []
+        for update, outcome in zip(updates, outcomes):
+            result = {'key': update.get('key'), **outcome}
+            if outcome.get('success'):
+                result['issue'] = refreshed.get(update['key'])
+            results.append(result)
+        succeeded = sum(1 for r in results if r['success'])
+        logger.info("Edição em lote: %d de %d issues atualizadas", succeeded, len(results))
+        return {
+            'success': succeeded == len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'results': results
+        }
+
+    def _known_issue_state(self, issue_key: str) -> Optional[tuple]:
+        """(tipo, status) da issue segundo o banco local ou os snapshots, sem chamar o Jira"""
+        row = db.session.query(JiraIssue.issue_type, JiraIssue.status).filter(JiraIssue.jira_key == issue_key).first()
+        if row:
+            return tuple(row)
+        project_clause = f"project = {issue_key.split('-')[0]}"
+        for key in self.snapshots.keys():
+            # O snapshot de agregação só tem colunas
+            if key[1] != project_clause or key[0] == 'aggregate':
+                continue
+            for issue in self.snapshots.get(key) or []:
+                if issue.get('jira_key') == issue_key:
+                    return issue.get('issue_type'), issue.get('status')
+        return None
+
+    def get_transitions(self, issue_key: str, refresh: bool = False) -> List[Dict]:
+        """Transições disponíveis para a issue, em cache por (projeto, tipo, status de origem)"""
+        project_key = issue_key.split('-')[0]
+        state = None if refresh else self._known_issue_state(issue_key)
+        if state:
+            cached = self.transitions.get((project_key,) + state)
+            if cached is not None:
+                return cached
+        # Uma chamada traz o tipo e o status atuais junto com as transições
+        data = self._make_request(f'issue/{issue_key}', {'fields': 'issuetype,status', 'expand': 'transitions'})
+        fields = data.get('fields', {})
+        key = (project_key, (fields.get('issuetype') or {}).get('name', ''), (fields.get('status') or {}).get('name', ''))
+        transitions = data.get('transitions', [])
+        self.transitions.set(key, transitions)
+        return transitions
+
+    def _update_issue_status(self, issue_key: str, new_status: str, write_through: bool = True) -> Dict:
         """Atualiza o status de uma issue através de transições"""
         try:
-            # Buscar transições disponíveis
-            transitions = self._make_request(f'issue/{issue_key}/transitions')
-            
-            # Encontrar a transição para o novo status
-            target_transition = None
-            for transition in transitions.get('transitions', []):
-                if transition.get('to', {}).get('name', '').lower() == new_status.lower():
-                    target_transition = transition
-                    break
-            
-            if not target_transition:
-                return {
-                    'success': False,
-                    'message': f'Transição para status "{new_status}" não encontrada'
-                }
-            
-            # Executar a transição
-            payload = {
-                'transition': {
-                    'id': target_transition['id']
+            for attempt in range(2):
+                # Transições em cache; na segunda tentativa, relidas do Jira
+                transitions = self.get_transitions(issue_key, refresh=attempt > 0)
+                
+                # Encontrar a transição para o novo status
+                target_transition = None
+                for transition in transitions:
+                    if transition.get('to', {}).get('name', '').lower() == new_status.lower():
+                        target_transition = transition
+                        break
+                
+                if not target_transition:
+                    if attempt == 0:
+                        continue
+                    return {
+                        'success': False,
+                        'message': f'Transição para status "{new_status}" não encontrada'
+                    }
+                
+                # Executar a transição
+                payload = {
+                    'transition': {
+                        'id': target_transition['id']
+                    }
                 }
-            }
-            
-            self._make_request_post(f'issue/{issue_key}/transitions', payload)
+                
+                try:
+                    self._make_request_post(f'issue/{issue_key}/transitions', payload)
+                    break
+                except JiraAPIError as e:
+                    # 400: transição não disponível, o cache estava desatualizado
+                    if e.status_code != 400 or attempt > 0:
+                        raise
+                    logger.info("Transição em cache recusada para %s, relendo transições", issue_key)
             
-            print(f"[UPDATE STATUS] Issue {issue_key} teve status alterado para {new_status}")
+            logger.info("Issue %s teve status alterado para %s", issue_key, new_status)
             
             return {
                 'success': True,
-                'message': f'Status da issue {issue_key} alterado para {new_status}'
+                'message': f'Status da issue {issue_key} alterado para {new_status}',
+                'issue': self._write_through(issue_key) if write_through else None
             }
             
         except Exception as e:
-            print(f"Erro ao atualizar status da issue {issue_key}: {e}")
+            logger.error("Erro ao atualizar status da issue %s: %s", issue_key, e)
             return {
                 'success': False,
                 'message': f'Erro ao atualizar status: {str(e)}'
@@ -728,35 +1359,19 @@ class JiraService:
     
     def _make_request_put(self, endpoint: str, data: Dict) -> Dict:
         """Faz requisição PUT para a API do Jira"""
-        import requests
-        
-        url = f"{self.base_url}/rest/api/3/{endpoint}"
-        headers = {
-            'Authorization': self._create_auth_header(),
-            'Content-Type': 'application/json'
-        }
-        
-        response = requests.put(url, headers=headers, json=data)
+        response = self.transport.request('PUT', endpoint, json_body=data)
         
         if response.status_code not in [200, 201, 204]:
-            raise Exception(f"Erro na API do Jira: {response.status_code} - {response.text}")
+            raise JiraAPIError(response.status_code, response.text)
         
         return response.json() if response.content else {}
     
     def _make_request_post(self, endpoint: str, data: Dict) -> Dict:
         """Faz requisição POST para a API do Jira"""
-        import requests
-        
-        url = f"{self.base_url}/rest/api/3/{endpoint}"
-        headers = {
-            'Authorization': self._create_auth_header(),
-            'Content-Type': 'application/json'
-        }
-        
-        response = requests.post(url, headers=headers, json=data)
+        response = self.transport.request('POST', endpoint, json_body=data)
         
         if response.status_code not in [200, 201, 204]:
-            raise Exception(f"Erro na API do Jira: {response.status_code} - {response.text}")
+            raise JiraAPIError(response.status_code, response.text)
         
         return response.json() if response.content else {}
 
@@ -0,0 +1,400 @@
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import and_, case, func, literal, or_
+from sqlalchemy.orm import defer
+
+from src.models.jira import JiraDailyRollup, JiraIssue, JiraIssueVersion, JiraVersion, JiraSyncState, db
+from src.services.jira_service import (
+    AGING_PRIORITIES, AGING_RANGES, RESOLVED_STATUSES, merge_filter_options, normalize_priority
+)
+
+# Idade máxima (segundos) dos dados locais antes de disparar um sync em segundo plano
+LOCAL_MAX_AGE = int(os.getenv('JIRA_LOCAL_MAX_AGE', '300'))
+
+# Linhas lidas do banco por vez nas exportações
+EXPORT_BATCH_SIZE = 500
+
+# Filtros que a timeline resolve pela tabela jira_daily_rollups
+ROLLUP_FILTERS = {'project', 'issuetype', 'priority'}
+
+
+class LocalIssueStore:
+    """Serve os endpoints do dashboard a partir das issues sincronizadas no banco local"""
+
+    def __init__(self, jira_service, scheduler, max_age: int = LOCAL_MAX_AGE):
+        self.jira_service = jira_service
+        self.scheduler = scheduler
+        self.max_age = max_age
+
+    # ------------------------------------------------------------------
+    # Frescor dos dados e sync em segundo plano
+    # ------------------------------------------------------------------
+    def _state(self, project_key: str) -> Optional[JiraSyncState]:
+        return JiraSyncState.query.filter_by(project_key=project_key).first()
+
+    def _jira_now(self, filters: Dict) -> datetime:
+        """Agora no fuso do Jira, comparável às datas gravadas no banco (horário local do Jira, sem fuso)"""
+        state = self._state(filters['project']) if filters.get('project') else None
+        if state is None or state.utc_offset_minutes is None:
+            return datetime.now()
+        return datetime.utcnow() + timedelta(minutes=state.utc_offset_minutes)
+
+    def is_ready(self, project_key: str) -> bool:
+        """Indica se o projeto já teve ao menos uma sincronização completa"""
+        state = self._state(project_key)
+        return bool(state and state.last_full_sync)
+
+    def freshness(self, project_key: str) -> Dict:
+        """Informa de quando são os dados locais do projeto"""
+        state = self._state(project_key)
+        last_sync = state.last_sync if state else None
+        age = (datetime.utcnow() - last_sync).total_seconds() if last_sync else None
+        return {
+            'source': 'local',
+            'last_sync': last_sync.isoformat() if last_sync else None,
+            'age_seconds': int(age) if age is not None else None,
+            'stale': age is None or age > self.max_age,
+            'refreshing': self.scheduler.is_running(project_key)
+        }
+
+    def ensure_fresh(self, project_key: str) -> None:
+        """Agenda um sync em segundo plano quando os dados locais estão ausentes ou velhos"""
+        state = self._state(project_key)
+        # Chaves vindas da URL só entram na agenda se o projeto existir
+        if not state and not self.scheduler.is_known(project_key):
+            return
+        if not state or not state.last_full_sync:
+            self.refresh_async(project_key, full=True)
+        elif (datetime.utcnow() - state.last_sync).total_seconds() > self.max_age:
+            self.refresh_async(project_key)
+
+    def refresh_async(self, project_key: str, full: bool = False) -> bool:
+        """Coloca o sync do projeto na fila do agendador, se ainda não houver um em andamento"""
+        return self.scheduler.enqueue(project_key, full=full)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def _apply_filters(self, query, filters: Dict):
+        """Aplica ao SQL os mesmos filtros que o JiraService traduz para JQL"""
+        if 'project' in filters:
+            query = query.filter(JiraIssue.project_key == filters['project'])
+        if 'status' in filters:
+            query = query.filter(JiraIssue.status == filters['status'])
+        if 'assignee' in filters:
+            query = query.filter(JiraIssue.assignee_id == filters['assignee'])
+        if 'reporter' in filters:
+            query = query.filter(JiraIssue.reporter_id == filters['reporter'])
+        if 'issuetype' in filters:
+            query = query.filter(JiraIssue.issue_type == filters['issuetype'])
+        if 'priority' in filters:
+            query = query.filter(JiraIssue.priority == filters['priority'])
+        if 'created_after' in filters:
+            query = query.filter(JiraIssue.created_date >= datetime.strptime(filters['created_after'], '%Y-%m-%d'))
+        if 'created_before' in filters:
+            query = query.filter(JiraIssue.created_date <= datetime.strptime(filters['created_before'], '%Y-%m-%d'))
+        if 'fix_version' in filters:
+            # Mesma comparação do JiraService (strip + lower), via índice da tabela de associação
+            version_match = and_(
+                JiraIssueVersion.issue_key == JiraIssue.jira_key,
+                JiraIssueVersion.kind == 'fix',
+                JiraIssueVersion.version_name_normalized == filters['fix_version'].strip().lower()
+            )
+            if 'project' in filters:
+                version_match = and_(version_match, JiraIssueVersion.project_key == filters['project'])
+            query = query.join(JiraIssueVersion, version_match)
+        return query
+
+    def _issue_to_dict(self, issue: JiraIssue, profile: str = 'table') -> Dict:
+        """Converte a linha do banco para o mesmo formato devolvido pelo JiraService"""
+        fix_versions = self._load_versions(issue.fix_versions)
+        # Assim como na busca ao Jira, só o perfil detail traz a descrição
+        description = (issue.description or '') if profile == 'detail' else ''
+        if description.startswith('{'):
+            try:
+                description = json.loads(description)
+            except ValueError:
+                pass
+        return {
+            'id': issue.jira_id,
+            'jira_key': issue.jira_key,
+            'jira_id': issue.jira_id,
+            'summary': issue.summary,
+            'description': description,
+            'project_key': issue.project_key,
+            'project_name': issue.project_name,
+            'status': issue.status,
+            'issue_type': issue.issue_type,
+            'priority': issue.priority or '',
+            'assignee_name': issue.assignee_name or '',
+            'assignee_id': issue.assignee_id or '',
+            'reporter_name': issue.reporter_name or '',
+            'reporter_id': issue.reporter_id or '',
+            'created_date': issue.created_date.isoformat() if issue.created_date else '',
+            'updated_date': issue.updated_date.isoformat() if issue.updated_date else '',
+            'resolution_date': issue.resolved_date.isoformat() if issue.resolved_date else '',
+            'fix_version': ', '.join(fix_versions),
+            'fix_versions': fix_versions,
+            'affected_versions': self._load_versions(issue.affected_versions),
+        }
+
+    def _load_versions(self, raw: Optional[str]) -> List[str]:
+        if not raw:
+            return []
+        try:
+            versions = json.loads(raw)
+        except ValueError:
+            return [v.strip() for v in raw.split(',') if v.strip()]
+        if isinstance(versions, str):
+            return [versions]
+        return [v for v in versions if v]
+
+    def get_issue(self, issue_key: str) -> Optional[Dict]:
+        issue = JiraIssue.query.filter_by(jira_key=issue_key).first()
+        return self._issue_to_dict(issue, 'detail') if issue else None
+
+    def get_issues(self, filters: Dict, page: int = 1, per_page: int = 50, fetch_all: bool = False,
+                   profile: str = 'table') -> Dict:
+        query = self._apply_filters(JiraIssue.query, filters).order_by(JiraIssue.created_date.desc())
+        if profile != 'detail':
+            query = query.options(defer(JiraIssue.description))
+        if fetch_all:
+            issues = [self._issue_to_dict(issue, profile) for issue in query.all()]
+            return {
+                'issues': issues,
+                'total': len(issues),
+                'pages': 1,
+                'current_page': 1,
+                'per_page': len(issues),
+                'has_next': False,
+                'has_prev': False
+            }
+        paginated = query.paginate(page=page, per_page=per_page, error_out=False)
+        return {
+            'issues': [self._issue_to_dict(issue, profile) for issue in paginated.items],
+            'total': paginated.total,
+            'pages': paginated.pages or 1,
+            'current_page': page,
+            'per_page': per_page,
+            'has_next': paginated.has_next,
+            'has_prev': paginated.has_prev
+        }
+
+    def iter_issues(self, filters: Dict, profile: str = 'table') -> Iterator[Dict]:
+        query = self._apply_filters(JiraIssue.query, filters).order_by(JiraIssue.created_date.desc())
+        if profile != 'detail':
+            query = query.options(defer(JiraIssue.description))
+        for issue in query.yield_per(EXPORT_BATCH_SIZE):
+            yield self._issue_to_dict(issue, profile)
+
+    def _distribution(self, column, filters: Dict, empty_label: str) -> Dict:
+        query = self._apply_filters(db.session.query(column, func.count(JiraIssue.id)), filters)
+        dist = {}
+        for value, count in query.group_by(column).all():
+            key = value or empty_label
+            dist[key] = dist.get(key, 0) + count
+        return dist
+
+    def _version_distribution(self, filters: Dict) -> Dict:
+        """Issues por fix version; issues sem versão contam como 'Não atribuído'"""
+        version_join = and_(
+            JiraIssueVersion.issue_key == JiraIssue.jira_key,
+            JiraIssueVersion.kind == 'fix'
+        )
+        query = db.session.query(JiraIssueVersion.version_name, func.count(JiraIssue.id)) \
+            .select_from(JiraIssue).outerjoin(JiraIssueVersion, version_join)
+        query = self._apply_filters(query, filters).group_by(JiraIssueVersion.version_name)
+        return {name or 'Não atribuído': count for name, count in query.all()}
+
+    def _distinct_values(self, column, filters: Dict) -> List[str]:
+        project_filter = {'project': filters['project']} if 'project' in filters else {}
+        query = self._apply_filters(db.session.query(column), project_filter).distinct()
+        return [value for (value,) in query.all() if value is not None]
+
+    def _status_in(self, normalized_statuses: List[str], filters: Dict):
+        """Condição SQL para status cuja forma normalizada (strip + lower) está na lista"""
+        statuses = [s for s in self._distinct_values(JiraIssue.status, filters) if s.strip().lower() in normalized_statuses]
+        return JiraIssue.status.in_(statuses)
+
+    def _priority_bucket(self, filters: Dict):
+        """CASE que traduz as prioridades existentes para as faixas normalizadas"""
+        buckets = {}
+        for priority in self._distinct_values(JiraIssue.priority, filters):
+            buckets.setdefault(normalize_priority(priority), []).append(priority)
+        whens = [(JiraIssue.priority.in_(values), bucket) for bucket, values in buckets.items() if bucket != 'Sem prioridade']
+        if not whens:
+            return literal('Sem prioridade')
+        return case(*whens, else_='Sem prioridade')
+
+    def _backlog_aging_rows(self, filters: Dict, now: datetime) -> List[tuple]:
+        """Issues abertas agrupadas por faixa de dias em aberto × prioridade normalizada"""
+        # days_open <= N  equivale a  created_date > now - (N + 1) dias
+        time_range = case(
+            (JiraIssue.created_date > now - timedelta(days=6), '0-5 dias'),
+            (JiraIssue.created_date > now - timedelta(days=16), '6-15 dias'),
+            (JiraIssue.created_date > now - timedelta(days=31), '16-30 dias'),
+            else_='Mais de 30 dias'
+        )
+        priority = self._priority_bucket(filters)
+        query = self._apply_filters(db.session.query(time_range, priority, func.count(JiraIssue.id)), filters)
+        query = query.filter(JiraIssue.resolved_date.is_(None), JiraIssue.created_date.isnot(None))
+        return query.group_by(time_range, priority).all()
+
+    def get_issue_counts(self, filters: Dict = None) -> Dict:
+        """Total, criadas e resolvidas nos últimos 30 dias, em uma única agregação"""
+        filters = filters or {}
+        thirty_days_ago = self._jira_now(filters) - timedelta(days=30)
+        resolved_recently = or_(
+            JiraIssue.resolved_date >= thirty_days_ago,
+            and_(self._status_in(RESOLVED_STATUSES, filters), JiraIssue.updated_date >= thirty_days_ago)
+        )
+        totals = self._apply_filters(db.session.query(
+            func.count(JiraIssue.id),
+            func.sum(case((JiraIssue.created_date >= thirty_days_ago, 1), else_=0)),
+            func.sum(case((resolved_recently, 1), else_=0))
+        ), filters).one()
+        total_issues, recent_issues, resolved_issues = (int(v or 0) for v in totals)
+        return {'total_issues': total_issues, 'recent_issues': recent_issues, 'resolved_issues': resolved_issues}
+
+    def get_dashboard_stats(self, filters: Dict = None) -> Dict:
+        """Estatísticas do dashboard calculadas sobre o banco local"""
+        filters = filters or {}
+        now = self._jira_now(filters)
+        counts = self.get_issue_counts(filters)
+
+        backlog_aging = {r: {p: 0 for p in AGING_PRIORITIES} for r in AGING_RANGES}
+        for time_range, priority, count in self._backlog_aging_rows(filters, now):
+            backlog_aging[time_range][priority] += count
+
+        return {
+            **counts,
+            'status_distribution': [
+                {'status': k, 'count': v} for k, v in self._distribution(JiraIssue.status, filters, 'Desconhecido').items()
+            ],
+            'type_distribution': [
+                {'type': k, 'count': v} for k, v in self._distribution(JiraIssue.issue_type, filters, 'Desconhecido').items()
+            ],
+            'priority_distribution': [
+                {'priority': k, 'count': v} for k, v in self._distribution(JiraIssue.priority, filters, 'Desconhecido').items()
+            ],
+            'assignee_distribution': [
+                {'assignee': k, 'count': v} for k, v in self._distribution(JiraIssue.assignee_name, filters, 'Não atribuído').items()
+            ],
+            'reporter_distribution': [
+                {'reporter': k, 'count': v} for k, v in self._distribution(JiraIssue.reporter_name, filters, 'Não atribuído').items()
+            ],
+            'version_distribution': [
+                {'version': k, 'count': v} for k, v in self._version_distribution(filters).items()
+            ],
+            'backlog_aging': [
+                {
+                    'time_range': time_range,
+                    'total': sum(priorities.values()),
+                    'critical': priorities['Critical'],
+                    'high': priorities['High'],
+                    'medium': priorities['Medium'],
+                    'low': priorities['Low'],
+                    'no_priority': priorities['Sem prioridade']
+                }
+                for time_range, priorities in backlog_aging.items()
+            ]
+        }
+
+    def _counts_by_day(self, column, filters: Dict, start: datetime) -> Dict[str, int]:
+        day = func.date(column)
+        query = self._apply_filters(db.session.query(day, func.count(JiraIssue.id)), filters)
+        query = query.filter(column >= start).group_by(day)
+        return {str(d): count for d, count in query.all() if d}
+
+    def _rollup_counts_by_day(self, metric: str, filters: Dict, start: datetime) -> Dict[str, int]:
+        query = db.session.query(JiraDailyRollup.day, func.sum(JiraDailyRollup.issue_count)).filter(
+            JiraDailyRollup.project_key == filters['project'],
+            JiraDailyRollup.metric == metric,
+            JiraDailyRollup.day >= start.date()
+        )
+        if 'issuetype' in filters:
+            query = query.filter(JiraDailyRollup.issue_type == filters['issuetype'])
+        if 'priority' in filters:
+            query = query.filter(JiraDailyRollup.priority == filters['priority'])
+        return {str(d): int(count) for d, count in query.group_by(JiraDailyRollup.day).all()}
+
+    def get_timeline_data(self, filters: Dict = None, days: int = 30) -> Dict:
+        """Issues criadas e resolvidas por dia nos últimos N dias"""
+        filters = filters or {}
+        today = self._jira_now(filters).date()
+        start = datetime.combine(today - timedelta(days=days - 1), datetime.min.time())
+        if 'project' in filters and set(filters) <= ROLLUP_FILTERS:
+            # Filtros cobertos pelas dimensões da tabela diária
+            created_counts = self._rollup_counts_by_day('created', filters, start)
+            resolved_counts = self._rollup_counts_by_day('resolved', filters, start)
+        else:
+            created_counts = self._counts_by_day(JiraIssue.created_date, filters, start)
+            resolved_counts = self._counts_by_day(JiraIssue.resolved_date, filters, start)
+        created_timeline = []
+        resolved_timeline = []
+        for i in range(days):
+            date_str = (today - timedelta(days=days - i - 1)).strftime('%Y-%m-%d')
+            created_timeline.append({'date': date_str, 'count': created_counts.get(date_str, 0)})
+            resolved_timeline.append({'date': date_str, 'count': resolved_counts.get(date_str, 0)})
+        return {
+            'created_timeline': created_timeline,
+            'resolved_timeline': resolved_timeline
+        }
+
+    def get_filter_options(self, project_key: str = None) -> Dict:
+        """Valores do banco local para os filtros, completados pelos metadados do projeto"""
+        filters = {'project': project_key} if project_key else {}
+
+        def distinct(*columns):
+            return self._apply_filters(db.session.query(*columns), filters).distinct().all()
+
+        versions = db.session.query(JiraIssueVersion.version_name).filter(JiraIssueVersion.kind == 'fix')
+        if project_key:
+            versions = versions.filter(JiraIssueVersion.project_key == project_key)
+        versions = {v for (v,) in versions.distinct().all()}
+        # Versões sincronizadas do projeto entram mesmo sem issues
+        synced_versions = db.session.query(JiraVersion.name)
+        if project_key:
+            synced_versions = synced_versions.filter(JiraVersion.project_key == project_key)
+        versions.update(v for (v,) in synced_versions.all() if v)
+        options = {
+            'statuses': sorted(s for (s,) in distinct(JiraIssue.status) if s),
+            'types': sorted(t for (t,) in distinct(JiraIssue.issue_type) if t),
+            'priorities': sorted(p for (p,) in distinct(JiraIssue.priority) if p),
+            'assignees': [{'id': i, 'name': n} for i, n in distinct(JiraIssue.assignee_id, JiraIssue.assignee_name) if i],
+            'reporters': [{'id': i, 'name': n} for i, n in distinct(JiraIssue.reporter_id, JiraIssue.reporter_name) if i],
+            'versions': sorted(versions)
+        }
+        # Status, versões e pessoas ainda sem issues vêm dos metadados (em cache no serviço)
+        metadata = self.jira_service.metadata_options(project_key) if project_key else None
+        return merge_filter_options(metadata, options) if metadata else options
+
+    def get_dashboard_bundle(self, filters: Dict = None, days: int = 30, page: int = 1, per_page: int = 50) -> Dict:
+        """Mesmo conteúdo do JiraService.get_dashboard_bundle, a partir do banco local"""
+        filters = filters or {}
+        scan_filters = {k: v for k, v in filters.items() if k != 'fix_version'}
+        project_key = filters.get('project')
+        project_filters = {'project': project_key} if project_key else {}
+        return {
+            'stats': self.get_dashboard_stats(scan_filters),
+            'timeline': self.get_timeline_data(scan_filters, days),
+            'filter_options': self.get_filter_options(project_key),
+            'project_total_issues': self._apply_filters(JiraIssue.query, project_filters).count(),
+            'issues': self.get_issues(filters, page, per_page)
+        }
+
+    def get_project_versions(self, project_key: str) -> List[Dict]:
+        versions = JiraVersion.query.filter_by(project_key=project_key).all()
+        return [
+            {
+                'id': v.jira_id,
+                'jira_id': v.jira_id,
+                'name': v.name,
+                'released': v.released,
+                'project_key': project_key
+            }
+            for v in versions
+        ]
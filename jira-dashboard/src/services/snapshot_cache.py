@@ -0,0 +1,145 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+# Tempo de vida (segundos) e quantidade máxima de snapshots em memória
+SNAPSHOT_TTL = float(os.getenv('JIRA_SNAPSHOT_TTL', '120'))
+SNAPSHOT_MAX_ENTRIES = int(os.getenv('JIRA_SNAPSHOT_MAX_ENTRIES', '16'))
+
+_AND_SPLIT = re.compile(r'\s+AND\s+', re.IGNORECASE)
+_OR_TOKEN = re.compile(r'\bOR\b', re.IGNORECASE)
+
+
+def normalize_jql(jql: str) -> str:
+    """Normaliza a JQL para uso como chave de cache.
+
+    Espaços são colapsados e, quando a consulta é só uma conjunção de
+    cláusulas, a ordem delas deixa de importar.
+    """
+    jql = ' '.join((jql or '').split())
+    if not jql or _OR_TOKEN.search(jql) or '(' in jql:
+        return jql
+    return ' AND '.join(sorted(_AND_SPLIT.split(jql)))
+
+
+class _Flight:
+    """Carga em andamento compartilhada pelos chamadores da mesma chave"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class SnapshotCache:
+    """Cache LRU com TTL e deduplicação de cargas concorrentes (single-flight)"""
+
+    def __init__(self, ttl: float = SNAPSHOT_TTL, max_entries: int = SNAPSHOT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        # Carga em andamento por chave; invalidate/update/set a desligam da chave
+        # (nova geração), e o resultado dela deixa de ir para o cache
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Retorna o valor em cache ou None se ausente/expirado"""
+        with self._lock:
+            return self._get_fresh(key)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Retorna o snapshot da chave, carregando-o uma única vez se necessário"""
+        with self._lock:
+            value = self._get_fresh(key)
+            if value is not None:
+                return value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+            with self._lock:
+                # Invalidada (ou atualizada) durante a carga: o valor pode ser anterior à mudança
+                if self._flights.get(key) is flight:
+                    self._store(key, flight.value)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Grava o valor na chave, substituindo o anterior e renovando a idade da entrada"""
+        with self._lock:
+            self._detach_flight(key)
+            self._store(key, value)
+
+    def keys(self, loading: bool = False) -> list:
+        """Chaves atualmente em cache (inclusive expiradas ainda não removidas).
+
+        Com loading=True, inclui as chaves com carga em andamento.
+        """
+        with self._lock:
+            keys = list(self._entries)
+            if loading:
+                keys.extend(k for k in self._flights if k not in self._entries)
+            return keys
+
+    def update(self, key: Hashable, transform: Callable[[Any], Any]) -> bool:
+        """Substitui o valor em cache por transform(valor), mantendo a idade da entrada"""
+        with self._lock:
+            self._detach_flight(key)
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            stored_at, value = entry
+            self._entries[key] = (stored_at, transform(value))
+            return True
+
+    def invalidate(self, match: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """Remove as entradas cuja chave satisfaz `match` (todas se omitido)"""
+        with self._lock:
+            for k in [k for k in self._flights if match is None or match(k)]:
+                self._detach_flight(k)
+            keys = [k for k in self._entries if match is None or match(k)]
+            for k in keys:
+                del self._entries[k]
+            return len(keys)
+
+    def _detach_flight(self, key: Hashable) -> None:
+        """Descarta a carga em andamento da chave: seu resultado não será guardado"""
+        self._flights.pop(key, None)
+
+    def _get_fresh(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,139 @@
+import contextvars
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict
+
+# Nível dos logs da aplicação (DEBUG, INFO, WARNING, ERROR)
+LOG_LEVEL = os.getenv('JIRA_LOG_LEVEL', 'INFO').upper()
+# 'text' (legível) ou 'json' (um objeto por linha, para agregadores de log)
+LOG_FORMAT = os.getenv('JIRA_LOG_FORMAT', 'text').lower()
+# Mensagens repetitivas (por issue, por página) aceitas por chave a cada intervalo (segundos)
+LOG_SAMPLE_LIMIT = int(os.getenv('JIRA_LOG_SAMPLE_LIMIT', '5'))
+LOG_SAMPLE_INTERVAL = float(os.getenv('JIRA_LOG_SAMPLE_INTERVAL', '60'))
+
+ROOT_LOGGER = 'jira'
+TEXT_FORMAT = '%(asctime)s %(levelname)s [%(name)s] [%(request_id)s] %(message)s'
+
+_request_id: contextvars.ContextVar = contextvars.ContextVar('request_id', default='-')
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger da aplicação, abaixo de 'jira' (ex.: get_logger('sync') -> 'jira.sync')"""
+    return logging.getLogger(f'{ROOT_LOGGER}.{name}')
+
+
+def submit_in_context(executor, fn, *args, **kwargs):
+    """executor.submit mantendo o request id (e demais contextvars) na thread do pool"""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class _RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get()
+        return True
+
+
+class TextFormatter(logging.Formatter):
+    """Linha legível; campos estruturados (extra={'fields': {...}}) vão ao final como chave=valor"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            line += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """Um objeto JSON por evento, com nível, logger, request id e campos estruturados"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'request_id': getattr(record, 'request_id', '-'),
+            'message': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class LogSampler:
+    """Limita mensagens repetitivas a `limit` por chave a cada `interval` segundos.
+
+    As descartadas são contadas e informadas quando a janela seguinte abre.
+    """
+
+    def __init__(self, limit: int = LOG_SAMPLE_LIMIT, interval: float = LOG_SAMPLE_INTERVAL):
+        self.limit = limit
+        self.interval = interval
+        self._windows: Dict[str, list] = {}  # chave -> [início, aceitas, descartadas]
+        self._lock = threading.Lock()
+
+    def log(self, logger: logging.Logger, key: str, level: int, msg: str, *args, **fields) -> None:
+        if not logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            suppressed = 0
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                window = self._windows[key] = [now, 0, 0]
+            if window[1] >= self.limit:
+                window[2] += 1
+                return
+            window[1] += 1
+        if suppressed:
+            logger.log(level, '%d mensagens "%s" suprimidas na janela anterior', suppressed, key)
+        logger.log(level, msg, *args, extra={'fields': fields} if fields else None)
+
+
+_sampler = LogSampler()
+
+
+def log_sampled(logger: logging.Logger, key: str, level: int, msg: str, *args, **fields) -> None:
+    """Registra a mensagem respeitando o limite por chave (ver LogSampler)"""
+    _sampler.log(logger, key, level, msg, *args, **fields)
+
+
+def configure_logging(app=None, level: str = LOG_LEVEL, fmt: str = LOG_FORMAT) -> None:
+    """Configura o logger 'jira' e, com um app Flask, o request id de cada requisição"""
+    logger = logging.getLogger(ROOT_LOGGER)
+    if not any(getattr(h, 'jira_handler', False) for h in logger.handlers):
+        handler = logging.StreamHandler(sys.stdout)
+        handler.jira_handler = True
+        handler.addFilter(_RequestIdFilter())
+        handler.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter(TEXT_FORMAT))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+    if app is not None:
+        _bind_request_id(app)
+
+
+def _bind_request_id(app) -> None:
+    from flask import request
+
+    @app.before_request
+    def _assign_request_id():
+        # Reaproveita o id do proxy/cliente quando válido, para correlacionar os logs
+        incoming = request.headers.get('X-Request-ID', '')
+        _request_id.set(incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex[:12])
+
+    @app.after_request
+    def _expose_request_id(response):
+        response.headers['X-Request-ID'] = _request_id.get()
+        return response
@@ -0,0 +1,241 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from src.models.jira import JiraProject, JiraSyncState, db
+from src.services.structured_log import get_logger
+
+logger = get_logger('sync')
+
+# Intervalo padrão (segundos) entre syncs delta de um projeto; 0 desliga os syncs periódicos
+SYNC_INTERVAL = int(os.getenv('JIRA_SYNC_INTERVAL', '300'))
+# Intervalos por projeto, ex.: "ECOM=60,MOBILE=900"
+SYNC_PROJECT_INTERVALS = os.getenv('JIRA_SYNC_PROJECT_INTERVALS', '')
+# Variação aleatória (segundos) somada a cada agendamento, para os projetos não sincronizarem juntos
+SYNC_JITTER = float(os.getenv('JIRA_SYNC_JITTER', '30'))
+# Máximo de syncs simultâneos, somando todos os projetos
+SYNC_MAX_CONCURRENCY = int(os.getenv('JIRA_SYNC_MAX_CONCURRENCY', '2'))
+# Intervalo (segundos) entre syncs completos, que removem issues apagadas no Jira
+SYNC_FULL_INTERVAL = int(os.getenv('JIRA_SYNC_FULL_INTERVAL', '86400'))
+# Projetos sincronizados desde o início, além dos que já têm estado no banco
+SYNC_PROJECTS = [p.strip() for p in os.getenv('JIRA_SYNC_PROJECTS', '').split(',') if p.strip()]
+# Teto do recuo após falhas consecutivas
+SYNC_ERROR_BACKOFF_MAX = 3600
+# Intervalo mínimo (segundos) entre releituras da lista de projetos ao validar um projeto desconhecido
+SYNC_PROJECT_LIST_REFRESH = int(os.getenv('JIRA_SYNC_PROJECT_LIST_REFRESH', '300'))
+
+
+def _parse_intervals(raw: str) -> Dict[str, int]:
+    intervals = {}
+    for item in raw.split(','):
+        key, _, value = item.partition('=')
+        if key.strip() and value.strip().isdigit():
+            intervals[key.strip()] = int(value)
+    return intervals
+
+
+class _ProjectSchedule:
+    """Agenda e resultado da última execução de um projeto"""
+
+    def __init__(self, project_key: str, interval: int):
+        self.project_key = project_key
+        self.interval = interval
+        self.next_run: Optional[float] = None  # time.monotonic()
+        self.force_full = False
+        self.running = False
+        self.runs = 0
+        self.consecutive_errors = 0
+        self.last_started: Optional[datetime] = None
+        self.last_finished: Optional[datetime] = None
+        self.last_duration: Optional[float] = None
+        self.last_result: Optional[Dict] = None
+        self.last_error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        next_in = None if self.next_run is None else max(0, int(self.next_run - time.monotonic()))
+        return {
+            'project_key': self.project_key,
+            'interval_seconds': self.interval,
+            'running': self.running,
+            'next_run_in_seconds': next_in,
+            'runs': self.runs,
+            'last_started': self.last_started.isoformat() if self.last_started else None,
+            'last_finished': self.last_finished.isoformat() if self.last_finished else None,
+            'last_duration_seconds': round(self.last_duration, 2) if self.last_duration is not None else None,
+            'last_mode': (self.last_result or {}).get('mode'),
+            'last_issues_changed': (self.last_result or {}).get('issues_synced'),
+            'last_issues_removed': (self.last_result or {}).get('issues_removed'),
+            'last_error': self.last_error,
+            'consecutive_errors': self.consecutive_errors
+        }
+
+
+class SyncScheduler:
+    """Executa os syncs delta dos projetos em segundo plano, fora das threads de requisição.
+
+    Cada projeto tem sua cadência (com jitter); um pool limita quantos syncs
+    rodam ao mesmo tempo. Pedidos manuais e automáticos entram na mesma fila
+    via enqueue(); só os manuais furam o recuo de um projeto com falhas.
+    """
+
+    def __init__(self, jira_service, interval: int = SYNC_INTERVAL, jitter: float = SYNC_JITTER,
+                 max_concurrency: int = SYNC_MAX_CONCURRENCY, full_interval: int = SYNC_FULL_INTERVAL,
+                 project_intervals: Dict[str, int] = None):
+        self.jira_service = jira_service
+        self.interval = interval
+        self.jitter = jitter
+        self.max_concurrency = max(1, max_concurrency)
+        self.full_interval = full_interval
+        self.project_intervals = project_intervals if project_intervals is not None else _parse_intervals(SYNC_PROJECT_INTERVALS)
+        self._projects: Dict[str, _ProjectSchedule] = {}
+        self._wakeup = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='jira-sync')
+        self._thread: Optional[threading.Thread] = None
+        self._app = None
+        self._project_list_read: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Controle
+    # ------------------------------------------------------------------
+    def start(self, app, projects: List[str] = None) -> None:
+        """Inicia o agendador com os projetos configurados e os já sincronizados antes"""
+        with app.app_context():
+            known = [s.project_key for s in JiraSyncState.query.all()]
+        for project_key in list(projects if projects is not None else SYNC_PROJECTS) + known:
+            self.register(project_key)
+        self._ensure_thread(app)
+
+    def register(self, project_key: str) -> None:
+        """Inclui o projeto na agenda periódica, se ainda não estiver"""
+        with self._wakeup:
+            if project_key in self._projects:
+                return
+            schedule = _ProjectSchedule(project_key, self.project_intervals.get(project_key, self.interval))
+            if schedule.interval > 0:
+                schedule.next_run = time.monotonic() + random.uniform(0, self.jitter)
+            self._projects[project_key] = schedule
+            self._wakeup.notify()
+
+    def is_known(self, project_key: str) -> bool:
+        """Projeto já agendado ou existente no Jira (tabela jira_projects, relida se preciso)"""
+        if project_key in self._projects or JiraProject.query.filter_by(key=project_key).first():
+            return True
+        now = time.monotonic()
+        if self._project_list_read is not None and now - self._project_list_read < SYNC_PROJECT_LIST_REFRESH:
+            return False
+        self._project_list_read = now
+        try:
+            return project_key in self.jira_service.sync_projects_to_db()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning("Não foi possível reler a lista de projetos: %s", e)
+            return False
+
+    def enqueue(self, project_key: str, full: bool = False, app=None, manual: bool = False) -> bool:
+        """Pede um sync imediato do projeto; False se ele já estiver rodando.
+
+        Pedidos automáticos (manual=False) respeitam o recuo de um projeto cujo
+        último sync falhou e também devolvem False nesse caso.
+        """
+        self.register(project_key)
+        self._ensure_thread(app)
+        with self._wakeup:
+            schedule = self._projects[project_key]
+            if schedule.running or (schedule.consecutive_errors and not manual):
+                return False
+            schedule.next_run = time.monotonic()
+            schedule.force_full = schedule.force_full or full
+            self._wakeup.notify()
+            return True
+
+    def enqueue_all(self, full: bool = False, app=None, manual: bool = False) -> List[str]:
+        return [key for key in list(self._projects) if self.enqueue(key, full, app, manual)]
+
+    def is_running(self, project_key: str) -> bool:
+        schedule = self._projects.get(project_key)
+        return bool(schedule and schedule.running)
+
+    def status(self, project_key: str = None) -> Dict:
+        with self._wakeup:
+            projects = [s.to_dict() for key, s in sorted(self._projects.items()) if project_key in (None, key)]
+        return {
+            'scheduler_running': bool(self._thread and self._thread.is_alive()),
+            'interval_seconds': self.interval,
+            'max_concurrency': self.max_concurrency,
+            'running': sum(1 for p in projects if p['running']),
+            'projects': projects
+        }
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+    def _ensure_thread(self, app=None) -> None:
+        with self._wakeup:
+            if self._thread and self._thread.is_alive():
+                return
+            if app is None:
+                from flask import current_app
+                app = current_app._get_current_object()
+            self._app = app
+            self._thread = threading.Thread(target=self._loop, name='jira-sync-scheduler', daemon=True)
+            self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            with self._wakeup:
+                now = time.monotonic()
+                running = sum(1 for s in self._projects.values() if s.running)
+                due = sorted(
+                    (s for s in self._projects.values() if not s.running and s.next_run is not None and s.next_run <= now),
+                    key=lambda s: s.next_run
+                )
+                for schedule in due[:max(0, self.max_concurrency - running)]:
+                    schedule.running = True
+                    self._executor.submit(self._run, schedule)
+                pending = [s.next_run for s in self._projects.values() if not s.running and s.next_run is not None]
+                timeout = max(0.0, min(pending) - now) if pending else None
+                self._wakeup.wait(timeout if timeout is None else min(timeout, 60))
+
+    def _run(self, schedule: _ProjectSchedule) -> None:
+        started = time.monotonic()
+        schedule.last_started = datetime.utcnow()
+        result, error = None, None
+        with self._app.app_context():
+            try:
+                full = schedule.force_full or self._full_due(schedule.project_key)
+                self.jira_service.sync_versions_to_db(schedule.project_key)
+                result = self.jira_service.sync_issues_to_db(schedule.project_key, full=full)
+            except Exception as e:
+                db.session.rollback()
+                error = str(e)
+                logger.exception("Erro no sync de %s", schedule.project_key)
+            finally:
+                db.session.remove()
+
+        with self._wakeup:
+            schedule.running = False
+            schedule.runs += 1
+            schedule.last_finished = datetime.utcnow()
+            schedule.last_duration = time.monotonic() - started
+            schedule.last_error = error
+            if error is None:
+                schedule.last_result = result
+                schedule.force_full = False
+                schedule.consecutive_errors = 0
+                delay = schedule.interval
+            else:
+                schedule.consecutive_errors += 1
+                base = schedule.interval or self.interval or 60
+                delay = min(SYNC_ERROR_BACKOFF_MAX, base * 2 ** schedule.consecutive_errors)
+            schedule.next_run = time.monotonic() + delay + random.uniform(0, self.jitter) if delay > 0 else None
+            self._wakeup.notify()
+
+    def _full_due(self, project_key: str) -> bool:
+        state = JiraSyncState.query.filter_by(project_key=project_key).first()
+        if not state or not state.last_full_sync:
+            return True
+        return self.full_interval > 0 and datetime.utcnow() - state.last_full_sync > timedelta(seconds=self.full_interval)
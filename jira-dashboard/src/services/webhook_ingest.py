@@ -0,0 +1,177 @@
+import hashlib
+import hmac
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.models.jira import JiraProject, JiraVersion, db
+from src.services.structured_log import get_logger
+
+logger = get_logger('webhook')
+
+# Segredo compartilhado com o webhook do Jira; vazio desativa o endpoint
+WEBHOOK_SECRET = os.getenv('JIRA_WEBHOOK_SECRET', '')
+# Eventos aplicados por lote e espera máxima (segundos) para completar um lote
+WEBHOOK_BATCH_SIZE = int(os.getenv('JIRA_WEBHOOK_BATCH_SIZE', '200'))
+WEBHOOK_BATCH_WAIT = float(os.getenv('JIRA_WEBHOOK_BATCH_WAIT', '1.0'))
+# Eventos aguardando aplicação; acima disso o webhook responde 503 e o Jira reenvia
+WEBHOOK_QUEUE_MAX = int(os.getenv('JIRA_WEBHOOK_QUEUE_MAX', '10000'))
+
+ISSUE_EVENTS = ('jira:issue_created', 'jira:issue_updated')
+ISSUE_DELETED = 'jira:issue_deleted'
+VERSION_DELETED = 'jira:version_deleted'
+
+
+def verify_signature(secret: str, body: bytes, headers, args) -> bool:
+    """Aceita assinatura HMAC-SHA256 (X-Hub-Signature) ou o segredo em header/query string"""
+    if not secret:
+        return False
+    signature = headers.get('X-Hub-Signature', '')
+    if signature.startswith('sha256='):
+        expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(signature[len('sha256='):], expected)
+    provided = headers.get('X-Webhook-Secret') or args.get('secret') or ''
+    return hmac.compare_digest(provided, secret)
+
+
+class WebhookIngestor:
+    """Enfileira eventos do webhook do Jira e os aplica em lotes no banco local e nos caches"""
+
+    def __init__(self, jira_service, batch_size: int = WEBHOOK_BATCH_SIZE,
+                 batch_wait: float = WEBHOOK_BATCH_WAIT, queue_max: int = WEBHOOK_QUEUE_MAX):
+        self.jira_service = jira_service
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self._queue: 'queue.Queue[Dict]' = queue.Queue(maxsize=queue_max)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._app = None
+        self.received = 0
+        self.applied = 0
+        self.batches = 0
+        self.last_applied: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    def enqueue(self, event: Dict, app=None) -> bool:
+        """Coloca o evento na fila; False se a fila estiver cheia"""
+        self._ensure_thread(app)
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            return False
+        self.received += 1
+        return True
+
+    def status(self) -> Dict:
+        return {
+            'enabled': bool(WEBHOOK_SECRET),
+            'queued': self._queue.qsize(),
+            'received': self.received,
+            'applied': self.applied,
+            'batches': self.batches,
+            'last_applied': self.last_applied.isoformat() if self.last_applied else None,
+            'last_error': self.last_error
+        }
+
+    def _ensure_thread(self, app=None) -> None:
+        with self._thread_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            if app is None:
+                from flask import current_app
+                app = current_app._get_current_object()
+            self._app = app
+            self._thread = threading.Thread(target=self._loop, name='jira-webhook', daemon=True)
+            self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            with self._app.app_context():
+                try:
+                    self.apply(batch)
+                    self.last_error = None
+                except Exception as e:
+                    db.session.rollback()
+                    self.last_error = str(e)
+                    logger.exception("Erro ao aplicar lote de %d eventos", len(batch))
+                finally:
+                    db.session.remove()
+
+    def apply(self, events: List[Dict]) -> None:
+        """Aplica um lote: só o último evento de cada issue/versão conta"""
+        issues: Dict[str, Dict] = {}
+        deleted_issues: Dict[str, bool] = {}
+        versions: Dict[str, Dict] = {}
+        deleted_versions: Dict[str, bool] = {}
+        for event in sorted(events, key=lambda e: e.get('timestamp') or 0):
+            name = event.get('webhookEvent', '')
+            issue = event.get('issue') or {}
+            version = event.get('version') or {}
+            if name in ISSUE_EVENTS and issue.get('key'):
+                issues[issue['key']] = issue
+                deleted_issues.pop(issue['key'], None)
+            elif name == ISSUE_DELETED and issue.get('key'):
+                issues.pop(issue['key'], None)
+                deleted_issues[issue['key']] = True
+            elif name.startswith('jira:version_') and version.get('id') is not None:
+                version_id = str(version['id'])
+                if name == VERSION_DELETED:
+                    versions.pop(version_id, None)
+                    deleted_versions[version_id] = True
+                else:
+                    versions[version_id] = version
+                    deleted_versions.pop(version_id, None)
+
+        if issues:
+            self.jira_service.ingest_issues(list(issues.values()))
+        if deleted_issues:
+            self.jira_service.remove_issues(list(deleted_issues))
+        if versions or deleted_versions:
+            self._apply_versions(versions, deleted_versions)
+
+        touched = {key.split('-')[0] for key in list(issues) + list(deleted_issues)}
+        for project_key in touched:
+            self.jira_service.invalidate_project(project_key)
+
+        self.applied += len(events)
+        self.batches += 1
+        self.last_applied = datetime.utcnow()
+        logger.info(
+            "Lote aplicado: %d issues gravadas, %d removidas, %d versões",
+            len(issues), len(deleted_issues), len(versions) + len(deleted_versions),
+            extra={'fields': {'events': len(events)}}
+        )
+
+    def _apply_versions(self, versions: Dict[str, Dict], deleted: Dict[str, bool]) -> None:
+        projects = dict(db.session.query(JiraProject.jira_id, JiraProject.key))
+        touched = set()
+        for version_id, version_data in versions.items():
+            project_key = projects.get(str(version_data.get('projectId')))
+            if not project_key:
+                existing = JiraVersion.query.filter_by(jira_id=version_id).first()
+                project_key = existing.project_key if existing else None
+            if not project_key:
+                logger.warning("Versão %s de projeto desconhecido (%s), ignorada", version_id, version_data.get('projectId'))
+                continue
+            self.jira_service.store_version(project_key, version_data)
+            touched.add(project_key)
+        if deleted:
+            removed = JiraVersion.query.filter(JiraVersion.jira_id.in_(list(deleted)))
+            touched.update(key for (key,) in removed.with_entities(JiraVersion.project_key).distinct())
+            removed.delete(synchronize_session=False)
+        db.session.commit()
+        # As opções de filtro em cache listam as versões do projeto
+        self.jira_service.metadata.invalidate(lambda key: key in touched)
@@ -0,0 +1,104 @@
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Issues do Jira simulado; o total não é múltiplo do tamanho de página de propósito
+STUB_ISSUE_COUNT = 237
+
+
+class JiraStub:
+    """Jira local com as duas paginações: /search (startAt) e /search/jql (nextPageToken)"""
+
+    def __init__(self, issue_count: int = STUB_ISSUE_COUNT):
+        self.issues = [{'id': str(10000 + i), 'key': f'P-{i}', 'fields': {'summary': f'Issue {i}'}} for i in range(issue_count)]
+        self.calls = []
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.base_url = f'http://127.0.0.1:{self._server.server_port}'
+
+    def start(self) -> 'JiraStub':
+        threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def calls_to(self, endpoint: str) -> list:
+        return [params for path, params in self.calls if path == endpoint]
+
+    # Funções no formato de JiraService._make_request / _make_request_post, para os paginadores
+    def get(self, endpoint: str, params: dict = None) -> dict:
+        response = requests.get(f'{self.base_url}/rest/api/3/{endpoint}', params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def post(self, endpoint: str, data: dict) -> dict:
+        response = requests.post(f'{self.base_url}/rest/api/3/{endpoint}', json=data)
+        response.raise_for_status()
+        return response.json()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, body, status: int = 200):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                endpoint = url.path.split('/rest/api/3/', 1)[-1]
+                stub.calls.append((endpoint, params))
+                max_results = int(params.get('maxResults', 50))
+                if endpoint == 'search':
+                    start_at = int(params.get('startAt', 0))
+                    return self._send({
+                        'startAt': start_at,
+                        'maxResults': max_results,
+                        'total': len(stub.issues),
+                        'issues': stub.issues[start_at:start_at + max_results],
+                    })
+                if endpoint == 'search/jql':
+                    # O token é opaco para o cliente; aqui é só o deslocamento
+                    start_at = int(params.get('nextPageToken') or 0)
+                    page = stub.issues[start_at:start_at + max_results]
+                    body = {'issues': page, 'isLast': start_at + max_results >= len(stub.issues)}
+                    if not body['isLast']:
+                        body['nextPageToken'] = str(start_at + max_results)
+                    return self._send(body)
+                self._send({'errorMessages': ['não encontrado']}, 404)
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                endpoint = url.path.split('/rest/api/3/', 1)[-1]
+                stub.calls.append((endpoint, body))
+                if endpoint == 'search/approximate-count':
+                    return self._send({'count': len(stub.issues)})
+                self._send({'errorMessages': ['não encontrado']}, 404)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+@pytest.fixture
+def jira_stub():
+    stub = JiraStub().start()
+    yield stub
+    stub.stop()
@@ -0,0 +1,69 @@
+import pytest
+
+from src.services.jira_pager import OffsetPager, TokenPager, make_pager
+
+PAGE_SIZE = 50
+FIELDS = 'summary'
+
+
+def _keys(issues):
+    return [issue['key'] for issue in issues]
+
+
+@pytest.fixture(params=['offset', 'token'])
+def pager(request, jira_stub):
+    return make_pager(jira_stub.get, jira_stub.post, fetch_workers=3, search_api=request.param)
+
+
+def test_make_pager_picks_style():
+    assert isinstance(make_pager(None, None, 1, 'offset'), OffsetPager)
+    assert isinstance(make_pager(None, None, 1, 'token'), TokenPager)
+    assert isinstance(make_pager(None, None, 1, 'desconhecido'), OffsetPager)
+
+
+def test_pages_return_every_issue_in_order(pager, jira_stub):
+    issues = [issue for page in pager.pages('project = P', FIELDS, PAGE_SIZE) for issue in page]
+    assert _keys(issues) == _keys(jira_stub.issues)
+
+
+def test_single_page_and_total(pager, jira_stub):
+    data = pager.page('project = P', 100, PAGE_SIZE, FIELDS)
+    assert _keys(data['issues']) == _keys(jira_stub.issues[100:150])
+    assert data['total'] == len(jira_stub.issues)
+
+
+def test_page_past_the_end_is_empty(pager, jira_stub):
+    data = pager.page('project = P', 1000, PAGE_SIZE, FIELDS)
+    assert data['issues'] == []
+    assert data['total'] == len(jira_stub.issues)
+
+
+def test_count(pager, jira_stub):
+    assert pager.count('project = P') == len(jira_stub.issues)
+
+
+def test_offset_pager_fetches_remaining_pages_by_offset(jira_stub):
+    pager = OffsetPager(jira_stub.get, jira_stub.post, fetch_workers=3)
+    list(pager.pages('project = P', FIELDS, PAGE_SIZE))
+    offsets = sorted(int(params['startAt']) for params in jira_stub.calls_to('search'))
+    assert offsets == list(range(0, len(jira_stub.issues), PAGE_SIZE))
+
+
+def test_token_pager_reuses_known_tokens(jira_stub):
+    pager = TokenPager(jira_stub.get, jira_stub.post, fetch_workers=1)
+    pager.page('project = P', 150, PAGE_SIZE, FIELDS)
+    walked = len(jira_stub.calls_to('search/jql'))
+    # Página já alcançada: um único pedido, direto com o token guardado
+    data = pager.page('project = P', 100, PAGE_SIZE, FIELDS)
+    assert len(jira_stub.calls_to('search/jql')) == walked + 1
+    assert _keys(data['issues']) == _keys(jira_stub.issues[100:150])
+
+
+def test_token_pager_counts_once_per_jql(jira_stub):
+    pager = TokenPager(jira_stub.get, jira_stub.post, fetch_workers=1)
+    for start_at in range(0, len(jira_stub.issues), PAGE_SIZE):
+        pager.page('project = P', start_at, PAGE_SIZE, FIELDS)
+    # Mesma consulta com outra ordem de cláusulas e espaços: mesma chave
+    pager.page('project = P  AND status = Done', 0, PAGE_SIZE, FIELDS)
+    pager.page('status = Done AND project = P', 0, PAGE_SIZE, FIELDS)
+    assert len(jira_stub.calls_to('search/approximate-count')) == 2
@@ -9,7 +9,6 @@ import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from '@
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, PieChart, Pie, Cell, LineChart, Line, Legend } from 'recharts'
 import { RefreshCw, Download, Filter, Search, BarChart3, Table as TableIcon, Settings, User, Star, Tag, Trophy, Clock, TrendingUp, CheckCircle, Activity } from 'lucide-react'
 import './App.css'
-import * as XLSX from 'xlsx'
 import { useNavigate } from 'react-router-dom'
 
 const API_BASE_URL = import.meta.env.VITE_API_URL + '/jira'
@@ -60,11 +59,7 @@ function App() {
 
   useEffect(() => {
     if (selectedProject) {
-      fetchIssues()
-      fetchDashboardStats()
-      fetchTimelineData(timelineDays)
-      fetchFilterOptions()
-      fetchProjectTotalIssues()
+      fetchDashboardBundle()
     }
   }, [selectedProject, filters, currentPage, timelineDays])
 
@@ -78,22 +73,6 @@ function App() {
     }
   }
 
-  const fetchIssues = async () => {
-    if (!selectedProject) return
-    setLoading(true)
-    try {
-      const params = new URLSearchParams(getActiveFilters());
-      const response = await fetch(`${API_BASE_URL}/issues?${params}`)
-      const data = await response.json()
-      setIssues(data.issues || [])
-      setTotalPages(data.pages || 1)
-    } catch (error) {
-      console.error('Erro ao buscar issues:', error)
-    } finally {
-      setLoading(false)
-    }
-  }
-
   const getRealFilterValue = (val) => (val === '__all__' || val === 'sem-valor' ? '' : val);
 
   // Helper para montar todos os filtros ativos (exceto sentinelas)
@@ -106,42 +85,34 @@ function App() {
     return params;
   };
 
-  const fetchDashboardStats = async () => {
+  // Uma única chamada traz issues, estatísticas, timeline, opções de filtro e total do projeto
+  const fetchDashboardBundle = async () => {
     if (!selectedProject) return
-    
-    try {
-      const params = new URLSearchParams(getActiveFilters());
-      const response = await fetch(`${API_BASE_URL}/dashboard/stats?${params}`)
-      const data = await response.json()
-      setDashboardStats(data)
-    } catch (error) {
-      console.error('Erro ao buscar estatísticas:', error)
-    }
-  }
-
-  const fetchTimelineData = async (days = 90) => {
-    if (!selectedProject) return
-    
+    setLoading(true)
     try {
-      const params = new URLSearchParams({ ...getActiveFilters(), days: days });
-      const response = await fetch(`${API_BASE_URL}/dashboard/timeline?${params}`)
+      const params = new URLSearchParams({ ...getActiveFilters(), page: currentPage, days: timelineDays });
+      const response = await fetch(`${API_BASE_URL}/dashboard/bundle?${params}`)
       const data = await response.json()
-      setTimelineData(data)
+      setIssues(data.issues?.issues || [])
+      setTotalPages(data.issues?.pages || 1)
+      setDashboardStats(data.stats)
+      setTimelineData(data.timeline)
+      setFilterOptions(data.filter_options || {})
+      setProjectTotalIssues(data.project_total_issues ?? null)
     } catch (error) {
-      console.error('Erro ao buscar dados de timeline:', error)
+      console.error('Erro ao buscar dados do dashboard:', error)
+    } finally {
+      setLoading(false)
     }
   }
 
-  const fetchFilterOptions = async () => {
-    if (!selectedProject) return
-    
-    try {
-      const response = await fetch(`${API_BASE_URL}/filters/options?project_key=${selectedProject}`)
+  const waitForSync = async (projectKey, previousRuns = 0, intervalMs = 2000, maxAttempts = 150) => {
+    for (let attempt = 0; attempt < maxAttempts; attempt++) {
+      await new Promise(resolve => setTimeout(resolve, intervalMs))
+      const response = await fetch(`${API_BASE_URL}/sync/status?project_key=${projectKey}`)
       const data = await response.json()
-      console.log('📋 Usuários carregados:', data.assignees?.length || 0, data.assignees);
-      setFilterOptions(data)
-    } catch (error) {
-      console.error('Erro ao buscar opções de filtro:', error)
+      const project = data.projects?.[0]
+      if (!project || (!project.running && project.runs > previousRuns)) return project
     }
   }
 
@@ -157,11 +128,10 @@ function App() {
       })
       
       if (response.ok) {
-        // Recarrega os dados após sincronização
-        await fetchIssues()
-        await fetchDashboardStats()
-        await fetchTimelineData()
-        await fetchFilterOptions()
+        // O sync roda em segundo plano: acompanha o status até terminar e recarrega os dados
+        const data = await response.json()
+        await waitForSync(selectedProject, data.status?.projects?.[0]?.runs || 0)
+        await fetchDashboardBundle()
       }
     } catch (error) {
       console.error('Erro ao sincronizar dados:', error)
@@ -190,34 +160,16 @@ function App() {
     setCurrentPage(1)
   }
 
-  const exportToXLSX = async () => {
+  // O backend gera o arquivo em streaming; o navegador grava direto em disco
+  const exportIssues = (format) => {
     if (!selectedProject) return;
-    try {
-      const params = new URLSearchParams({ ...getActiveFilters(), fetch_all: 'true' });
-      const response = await fetch(`${API_BASE_URL}/issues?${params}`);
-      const data = await response.json();
-      const allIssues = data.issues || [];
-      if (!allIssues.length) return;
-      const headers = ['Chave', 'Resumo', 'Status', 'Tipo', 'Prioridade', 'Versão/Release', 'Responsável', 'Reporter', 'Criado', 'Atualizado'];
-      const rows = allIssues.map(issue => [
-        issue.jira_key,
-        issue.summary,
-        issue.status,
-        issue.issue_type,
-        issue.priority || '',
-        Array.isArray(issue.fix_versions) ? (issue.fix_versions.length > 0 ? issue.fix_versions.join('; ') : '-') : (issue.fix_versions || '-'),
-        issue.assignee_name || '',
-        issue.reporter_name || '',
-        issue.created_date ? new Date(issue.created_date).toLocaleDateString() : '',
-        issue.updated_date ? new Date(issue.updated_date).toLocaleDateString() : ''
-      ]);
-      const worksheet = XLSX.utils.aoa_to_sheet([headers, ...rows]);
-      const workbook = XLSX.utils.book_new();
-      XLSX.utils.book_append_sheet(workbook, worksheet, 'Issues');
-      XLSX.writeFile(workbook, `jira-issues-${selectedProject}-${new Date().toISOString().split('T')[0]}.xlsx`);
-    } catch (error) {
-      console.error('Erro ao exportar XLSX:', error);
-    }
+    const params = new URLSearchParams({ ...getActiveFilters(), format });
+    const link = document.createElement('a');
+    link.href = `${API_BASE_URL}/export?${params}`;
+    link.download = `jira-issues-${selectedProject}-${new Date().toISOString().split('T')[0]}.${format}`;
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
   };
 
   const getStatusColor = (status) => {
@@ -297,19 +249,6 @@ function App() {
     return true;
   });
 
-  // Buscar total do projeto SEM filtro
-  const fetchProjectTotalIssues = async () => {
-    if (!selectedProject) return;
-    try {
-      const params = new URLSearchParams({ project_key: selectedProject });
-      const response = await fetch(`${API_BASE_URL}/dashboard/stats?${params}`);
-      const data = await response.json();
-      setProjectTotalIssues(data.total_issues);
-    } catch (error) {
-      setProjectTotalIssues(null);
-    }
-  };
-
   const handleLogout = () => {
     localStorage.removeItem('logged_in');
     navigate('/login');
@@ -393,12 +332,12 @@ function App() {
       const result = await response.json();
 
       if (result.success) {
-        // Recarregar dados após sucesso
-        await Promise.all([
-          fetchIssues(),
-          fetchDashboardStats(),
-          fetchFilterOptions()
-        ]);
+        // A resposta já traz a issue relida do Jira: atualiza a linha na hora
+        if (result.issue) {
+          setIssues(prev => prev.map(issue => issue.jira_key === issueKey ? { ...issue, ...result.issue } : issue));
+        }
+        // Estatísticas vêm do cache já atualizado no backend, sem nova varredura do Jira
+        fetchDashboardBundle();
         
         console.log(`✅ Issue ${issueKey} atualizada com sucesso`);
         
@@ -1404,10 +1343,16 @@ function App() {
                     Limpar Filtros
                   </Button>
                 </div>
-                <Button onClick={exportToXLSX} className="flex items-center gap-2">
-                  <Download className="h-4 w-4" />
-                  Exportar XLSX
-                </Button>
+                <div className="flex items-center gap-2">
+                  <Button onClick={() => exportIssues('csv')} variant="outline" className="flex items-center gap-2">
+                    <Download className="h-4 w-4" />
+                    Exportar CSV
+                  </Button>
+                  <Button onClick={() => exportIssues('xlsx')} className="flex items-center gap-2">
+                    <Download className="h-4 w-4" />
+                    Exportar XLSX
+                  </Button>
+                </div>
               </div>
 
               {/* Bloco de filtros avançados abaixo da aba Planilha */}